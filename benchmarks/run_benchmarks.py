@@ -0,0 +1,164 @@
+# Benchmark suite: times scanning, cleaning, planning and renaming for every
+# script variant on a synthetic library, and writes the results as JSON.
+# Run from the repository root:  python -m benchmarks.run_benchmarks --output bench.json
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.stub_omdb import start_stub_server
+from benchmarks.synthetic import generate_library
+
+import rename_movies
+import rename_movies_advanced
+import rename_movies_basic
+import rename_movies_subtitles
+import rename_movies_subtitles_advanced
+import rename_movies_subtitles_advanced2
+from movie_renamer import files, pipeline
+from movie_renamer.scan import VIDEO, scan_dir, scan_folders, walk_media
+
+CLEANERS = {
+    'rename_movies': rename_movies.clean_title,
+    'rename_movies_advanced': rename_movies_advanced.clean_title,
+    'rename_movies_basic': rename_movies_basic.clean_movie_name,
+    'rename_movies_subtitles': rename_movies_subtitles.clean_movie_name,
+    'rename_movies_subtitles_advanced': rename_movies_subtitles_advanced.clean_movie_name,
+    'rename_movies_subtitles_advanced2': rename_movies_subtitles_advanced2.clean_movie_name,
+}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def timed(func, *args, **kwargs):
+    # Runs func with its console output suppressed; returns (seconds, result)
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        return time.perf_counter() - start, result
+
+
+def result(variant, stage, seconds, items):
+    return {
+        'variant': variant,
+        'stage': stage,
+        'seconds': round(seconds, 6),
+        'items': items,
+        'items_per_second': round(items / seconds, 1) if seconds else None,
+    }
+
+
+def fresh_copy(template, work_root, name):
+    target = os.path.join(work_root, name)
+    shutil.copytree(template, target)
+    return target
+
+
+def run(args):
+    default_root = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    if args.root:
+        os.makedirs(args.root, exist_ok=True)
+    work_root = tempfile.mkdtemp(prefix='movie-renamer-bench-', dir=args.root or default_root)
+    server, url = start_stub_server(latency=args.stub_latency / 1000)
+    files.OMDB_URL = url
+    pipeline.OMDB_URL = url
+    results = []
+
+    try:
+        template = os.path.join(work_root, 'template')
+        file_count = generate_library(template, args.folders, args.files_per_folder, args.subtitle_ratio,
+                                      args.loose, args.seed)
+
+        # Scanning is shared by every variant
+        def scan():
+            folders = [(entry.name, entry.path) for entry in scan_dir(template) if entry.is_dir]
+            return list(scan_folders(folders, args.scan_workers))
+
+        seconds, listings = timed(scan)
+        results.append(result('shared', 'scan', seconds, len(listings)))
+        seconds, media = timed(lambda: list(walk_media(template)))
+        results.append(result('shared', 'walk', seconds, len(media)))
+
+        video_names = [entry.name for entry in media if entry.kind == VIDEO]
+        for variant, cleaner in CLEANERS.items():
+            seconds, _ = timed(lambda: [cleaner(name) for name in video_names])
+            results.append(result(variant, 'clean', seconds, len(video_names)))
+
+        seconds, plan = timed(rename_movies_advanced.plan_renames, template, jobs=args.jobs)
+        results.append(result('rename_movies_advanced', 'plan', seconds, len(plan.operations)))
+        seconds, plan = timed(rename_movies_advanced.plan_renames, template, verify_online=True,
+                              workers=args.workers, rate=0)
+        results.append(result('rename_movies_advanced', 'plan_online', seconds, len(plan.operations)))
+        seconds, plan = timed(rename_movies.plan_directory, template, 'bench', workers=args.workers, rate=0,
+                              jobs=args.jobs)
+        results.append(result('rename_movies', 'plan_online', seconds, len(plan.operations)))
+
+        # Full runs, each on its own copy of the library
+        runs = {
+            'rename_movies': lambda path: rename_movies.rename_files_in_directory(
+                path, 'bench', dry_run=False, workers=args.workers, rate=0, jobs=args.jobs),
+            'rename_movies_advanced': lambda path: rename_movies_advanced.rename_stuff(
+                path, incremental=False, jobs=args.jobs),
+            'rename_movies_basic': rename_movies_basic.rename_folders_and_files,
+            'rename_movies_subtitles': rename_movies_subtitles.rename_folders_and_files,
+            'rename_movies_subtitles_advanced': rename_movies_subtitles_advanced.rename_folders_and_files,
+            'rename_movies_subtitles_advanced2': rename_movies_subtitles_advanced2.rename_folders_and_files,
+        }
+        for variant, rename in runs.items():
+            library = fresh_copy(template, work_root, variant)
+            seconds, _ = timed(rename, library)
+            results.append(result(variant, 'rename', seconds, file_count))
+            shutil.rmtree(library)
+    finally:
+        server.shutdown()
+        shutil.rmtree(work_root, ignore_errors=True)
+
+    return {
+        'revision': git_revision(),
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': vars(args),
+        'files': file_count,
+        'results': results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every renamer variant on a synthetic library.")
+    parser.add_argument('--folders', type=int, default=2000, help="Movie folders to generate")
+    parser.add_argument('--files-per-folder', type=int, default=1, help="Video files per folder (CD1, CD2, ...)")
+    parser.add_argument('--subtitle-ratio', type=float, default=0.5, help="Chance that a video gets a subtitle")
+    parser.add_argument('--loose', type=int, default=0, help="Loose video files in the library root")
+    parser.add_argument('--seed', type=int, default=42, help="Random seed for the generated names")
+    parser.add_argument('--root', help="Where to build the library (default: /dev/shm when available)")
+    parser.add_argument('--workers', type=int, default=8, help="Concurrent OMDb lookups")
+    parser.add_argument('--scan-workers', type=int, default=1, help="Threads for folder listing")
+    parser.add_argument('--jobs', type=int, default=1, help="Processes for name parsing")
+    parser.add_argument('--stub-latency', type=float, default=0.0, help="Simulated OMDb latency in ms")
+    parser.add_argument('--output', help="Write JSON results here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(report)
+    else:
+        sys.stdout.write(report + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Local stand-in for the OMDb API so online paths can be benchmarked offline
+import json
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+
+    def do_GET(self):
+        params = parse_qs(urlparse(self.path).query)
+        if self.latency:
+            time.sleep(self.latency)
+
+        query = (params.get('t') or params.get('s') or [''])[0]
+        years = re.findall(r'\b(?:19|20)\d{2}\b', query)
+        year = (params.get('y') or years[-1:] or ['2000'])[0]
+        title = re.sub(r'\b(?:19|20)\d{2}\b', '', query).strip().title()
+
+        if 'Season' in params:
+            # Ten episodes per season, season N airing daily from January (2000 + N)
+            season = int(params['Season'][0])
+            data = {'Response': 'True', 'Title': 'Stub Series', 'Season': str(season), 'totalSeasons': '3',
+                    'Episodes': [{'Title': f"Episode {n}", 'Released': f"{2000 + season}-01-{n:02d}",
+                                  'Episode': str(n), 'imdbID': f"tt{season:03d}{n:04d}"} for n in range(1, 11)]}
+        elif not title:
+            data = {'Response': 'False', 'Error': 'Movie not found!'}
+        elif params.get('type') == ['series']:
+            imdb_id = f"tt{zlib.crc32(title.encode()) % 10 ** 7:07d}"
+            data = {'Response': 'True', 'Title': title, 'Year': f"{year}–", 'imdbID': imdb_id,
+                    'totalSeasons': '3', 'Type': 'series'}
+        elif 's' in params:
+            data = {'Response': 'True', 'totalResults': '3', 'Search': [
+                {'Title': title, 'Year': year, 'imdbID': 'tt0000001', 'Type': 'movie'},
+                {'Title': f"{title} II", 'Year': str(int(year) + 2), 'imdbID': 'tt0000002', 'Type': 'movie'},
+                {'Title': f"The Making of {title}", 'Year': year, 'imdbID': 'tt0000003', 'Type': 'movie'},
+            ]}
+        else:
+            data = {'Response': 'True', 'Title': title, 'Year': year, 'imdbID': 'tt0000001', 'Type': 'movie',
+                    'Rated': 'PG-13', 'Released': f"01 Jan {year}", 'Runtime': '120 min', 'Genre': 'Drama, Comedy',
+                    'Director': 'Stub Director', 'Writer': 'N/A', 'Actors': 'Actor One, Actor Two',
+                    'Plot': f"A stub plot for {title}.", 'imdbRating': '7.0'}
+
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub_server(latency=0.0, port=0):
+    # Returns (server, base_url); call server.shutdown() when done
+    handler = type('Handler', (StubHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
@@ -0,0 +1,54 @@
+# Synthetic media-library generator for the benchmark suite
+import os
+import random
+
+WORDS = [
+    'The', 'Dark', 'Night', 'Return', 'of', 'King', 'Lost', 'City', 'Last', 'Dream', 'Requiem',
+    'Blade', 'Runner', 'Heat', 'Matrix', 'Star', 'Wars', 'Empire', 'Strikes', 'Back', 'Inception',
+    'Parasite', 'Memories', 'Murder', 'Godfather', 'Part', 'Alien', 'Escape', 'New', 'York', 'Love',
+]
+QUALITY = ['1080p', '720p', '2160p', '480p']
+SOURCE = ['BluRay', 'WEBRip', 'WEB-DL', 'HDRip', 'BRRip', 'DVDRip']
+CODEC = ['x264', 'x265', 'HEVC', 'H264', 'AVC']
+EXTRAS = ['10bit', 'AAC', 'DD5.1', 'DDP5.1', 'EXTENDED', 'PROPER', 'REMASTERED', 'NF', '8CH']
+GROUPS = ['YIFY', 'RARBG', 'PSA', 'BONE', 'Pahe.in', 'YTS.AM']
+VIDEO_EXTS = ['.mkv', '.mp4', '.avi']
+LANGS = ['en', 'eng', 'English', 'fr', 'es', 'de']
+
+
+def release_name(rng, index):
+    # The index keeps titles unique, so the simpler variants never collide
+    title = rng.sample(WORDS, rng.randint(1, 4)) + [str(index)]
+    year = str(rng.randint(1950, 2024))
+    parts = title + [year, rng.choice(QUALITY), rng.choice(SOURCE)]
+    parts += rng.sample(EXTRAS, rng.randint(0, 2))
+    parts.append(f"{rng.choice(CODEC)}-{rng.choice(GROUPS)}")
+    separator = rng.choice(['.', '.', '_', ' '])
+    return separator.join(parts)
+
+
+def generate_library(root, folders=1000, files_per_folder=1, subtitle_ratio=0.5, loose=0, seed=42):
+    # Creates folders of scene-release style names with empty media files;
+    # returns the number of files written
+    rng = random.Random(seed)
+    os.makedirs(root, exist_ok=True)
+    written = 0
+
+    for index in range(folders):
+        name = release_name(rng, index)
+        folder = os.path.join(root, name)
+        os.makedirs(folder, exist_ok=True)
+        for part in range(files_per_folder):
+            suffix = f".CD{part + 1}" if files_per_folder > 1 else ''
+            stem = name + suffix
+            open(os.path.join(folder, stem + rng.choice(VIDEO_EXTS)), 'w').close()
+            written += 1
+            if rng.random() < subtitle_ratio:
+                open(os.path.join(folder, f"{stem}.{rng.choice(LANGS)}.srt"), 'w').close()
+                written += 1
+
+    for index in range(loose):
+        open(os.path.join(root, release_name(rng, folders + index) + rng.choice(VIDEO_EXTS)), 'w').close()
+        written += 1
+
+    return written
@@ -0,0 +1 @@
+# Shared building blocks for the rename_movies*.py scripts
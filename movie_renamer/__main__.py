@@ -0,0 +1,3 @@
+from movie_renamer.cli import main
+
+raise SystemExit(main())
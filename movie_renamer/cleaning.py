@@ -0,0 +1,35 @@
+import re
+
+
+def _trie_to_regex(node):
+    # node maps a single character to its child node; '' marks the end of a keyword
+    branches = [re.escape(char) + _trie_to_regex(child)
+                for char, child in sorted(node.items()) if char]
+    terminal = '' in node
+
+    if not branches:
+        return ''
+    if len(branches) == 1 and not terminal:
+        return branches[0]
+
+    group = '(?:' + '|'.join(branches) + ')'
+    # Greedy '?' tries the longer keyword first and only falls back to the
+    # shorter one when the trailing word boundary does not match
+    return group + '?' if terminal else group
+
+
+def compile_keywords(keywords):
+    # Merge every keyword into one trie so each name is scanned once,
+    # instead of once per keyword with a freshly built pattern
+    trie = {}
+    for word in keywords:
+        node = trie
+        for char in word.lower():
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    return re.compile(r'\b' + _trie_to_regex(trie) + r'\b', re.IGNORECASE)
+
+
+def strip_keywords(name: str, pattern) -> str:
+    return pattern.sub('', name)
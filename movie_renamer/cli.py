@@ -0,0 +1,254 @@
+import argparse
+import os
+
+from movie_renamer import files, pipeline, tv
+from movie_renamer.duplicates import library_duplicates, pick_keeper, plan_quarantine
+from movie_renamer.folders import rename_folders_and_files
+from movie_renamer.journal import Journal, latest_journal, undo_journal
+from movie_renamer.local_index import DEFAULT_TITLE_TYPES, LocalIndex, build_index
+from movie_renamer.lookup import DEFAULT_RATE, DEFAULT_WORKERS
+from movie_renamer.omdb_cache import DEFAULT_CACHE_PATH, OmdbCache
+from movie_renamer.plan import RenamePlan, apply_plan, ordered_operations
+from movie_renamer.profiles import PROFILES, parse_cache_info
+from movie_renamer.sidecars import SIDECARS
+from movie_renamer.stats import Stats, profiled
+from movie_renamer.watch import DEFAULT_SETTLE
+
+# Profiles usable without OMDb; 'advanced' and 'search' only build lookup queries
+LOCAL_PROFILES = ['basic', 'subtitles', 'subtitles-advanced', 'subtitles-advanced2']
+
+
+def add_lookup_options(parser):
+    parser.add_argument('--cache', default=DEFAULT_CACHE_PATH, help="SQLite file caching OMDb responses")
+    parser.add_argument('--no-cache', action='store_true', help="Always query OMDb, ignoring the response cache")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help="Concurrent OMDb lookups")
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help="Max OMDb requests per second (0 disables the limit)")
+    parser.add_argument('--jobs', type=int, default=1,
+                        help="Parse names in N worker processes (0 = one per CPU)")
+
+
+def add_folders_parser(parser):
+    parser.add_argument('directory', nargs='?', help="Target base directory containing movie folders")
+    parser.add_argument('--dry-run', action='store_true', help="Preview changes without renaming")
+    parser.add_argument('--verify-online', action='store_true', help="Use OMDb API to fetch correct title/year")
+    parser.add_argument('--verify-local', metavar='INDEX',
+                        help="Resolve titles against an offline index built by movie_renamer.local_index")
+    add_lookup_options(parser)
+    parser.add_argument('--full-scan', action='store_true',
+                        help="Ignore the .rename_state.json index and re-list every folder")
+    parser.add_argument('--scan-workers', type=int, default=1,
+                        help="List folders in parallel (helps on SMB/NFS mounts)")
+    parser.add_argument('--plan-out', metavar='FILE', help="Write the computed rename plan as JSON")
+    parser.add_argument('--apply-plan', metavar='FILE', help="Execute a previously saved plan without rescanning")
+    parser.add_argument('--stats', nargs='?', const='-', metavar='FILE',
+                        help="Print per-stage timings and counters, or write them as JSON to FILE")
+    parser.add_argument('--profile', metavar='FILE', help="Write cProfile data for the run to FILE")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and rename new downloads as they finish (inotify, or polling)")
+    parser.add_argument('--settle', type=float, default=DEFAULT_SETTLE,
+                        help="Seconds a new download must stop growing before it is renamed")
+    parser.add_argument('--duplicates', choices=['report', 'merge'],
+                        help="When a target folder is taken, compare the movie files by content and report "
+                             "identical copies, or move them to .duplicates/")
+    parser.add_argument('--sidecars', choices=sorted(SIDECARS),
+                        help="Write movie.nfo and/or movie.json from the OMDb data into each renamed folder "
+                             "(needs --verify-online)")
+    parser.add_argument('--refresh-sidecars', action='store_true',
+                        help="With --sidecars, also cover folders already named 'Title (Year)', from cached OMDb "
+                             "data where possible; unchanged sidecars are not rewritten")
+    parser.add_argument('--undo', nargs='?', const='latest', metavar='JOURNAL',
+                        help="Roll back a run from its journal (default: the latest run in directory)")
+    parser.set_defaults(func=run_folders)
+
+
+def add_files_parser(parser):
+    parser.add_argument('directory', help="Directory whose video and subtitle files are renamed in place")
+    parser.add_argument('--dry-run', action='store_true', help="Preview changes without renaming")
+    parser.add_argument('--include-loose', action='store_true', help="Also rename files directly in directory")
+    add_lookup_options(parser)
+    parser.add_argument('--plan-out', metavar='FILE', help="Write the computed rename plan as JSON")
+    parser.set_defaults(func=run_files)
+
+
+def add_tv_parser(parser):
+    parser.add_argument('directory', help="Directory holding episode files, in any folder layout")
+    parser.add_argument('--dry-run', action='store_true', help="Preview changes without renaming")
+    parser.add_argument('--offline', action='store_true',
+                        help="Name episodes from the release name only (no episode titles, no OMDb)")
+    add_lookup_options(parser)
+    parser.add_argument('--plan-out', metavar='FILE', help="Write the computed rename plan as JSON")
+    parser.set_defaults(func=run_tv)
+
+
+def add_clean_parser(parser):
+    parser.add_argument('directory', help="Target base directory containing movie folders")
+    parser.add_argument('--profile', choices=LOCAL_PROFILES, default='subtitles-advanced2',
+                        help="Cleaning rules of one of the original scripts")
+    parser.add_argument('--scan-workers', type=int, default=1,
+                        help="List folders in parallel (helps on SMB/NFS mounts)")
+    parser.set_defaults(func=run_clean)
+
+
+def add_dupes_parser(parser):
+    parser.add_argument('directory', help="Library to search for identical video files")
+    parser.add_argument('--merge', action='store_true',
+                        help="Keep one copy of each and move the others under .duplicates/ (undoable)")
+    parser.add_argument('--stats', action='store_true', help="Print hashing timings and counters")
+    parser.set_defaults(func=run_dupes)
+
+
+def add_undo_parser(parser):
+    parser.add_argument('target', nargs='?', default='.', help="Journal file, or directory holding .rename_journal")
+    parser.add_argument('--dry-run', action='store_true', help="Show what would be restored")
+    parser.set_defaults(func=run_undo)
+
+
+def add_index_parser(parser):
+    parser.add_argument('dump', help="Path to title.basics.tsv or title.basics.tsv.gz")
+    parser.add_argument('index', help="SQLite index file to create")
+    parser.add_argument('--types', default=','.join(DEFAULT_TITLE_TYPES),
+                        help="Comma-separated titleType values to keep")
+    parser.set_defaults(func=run_index)
+
+
+def undo(journal_path, dry_run=False):
+    undone, failed = undo_journal(journal_path, dry_run=dry_run)
+    print(f"Restored {undone} rename(s), {failed} failed")
+    return 1 if failed else 0
+
+
+def run_folders(args, parser):
+    if args.apply_plan:
+        plan = RenamePlan.load(args.apply_plan)
+        if args.dry_run:
+            for op in ordered_operations(plan.operations):
+                print(f"Would rename: {op.source} -> {op.target}")
+        else:
+            pipeline.apply_renames(plan)
+        return 0
+    if args.undo:
+        journal_path = latest_journal(args.directory or '.') if args.undo == 'latest' else args.undo
+        if not journal_path:
+            parser.error("no journal found to undo")
+        return undo(journal_path, args.dry_run)
+    if not args.directory:
+        parser.error("directory is required unless --apply-plan or --undo is given")
+    if args.sidecars and not args.verify_online:
+        parser.error("--sidecars needs the OMDb data from --verify-online")
+    if args.refresh_sidecars and not args.sidecars:
+        parser.error("--refresh-sidecars needs --sidecars")
+
+    cache = OmdbCache(args.cache) if args.verify_online and not args.no_cache else None
+    local_index = LocalIndex(args.verify_local) if args.verify_local else None
+    stats = Stats()
+    with profiled(args.profile):
+        if args.watch:
+            # Stats add up over every download handled until Ctrl+C
+            pipeline.watch_directory(args.directory, settle=args.settle, dry_run=args.dry_run,
+                                     verify_online=args.verify_online, cache=cache, workers=args.workers,
+                                     rate=args.rate, jobs=args.jobs, local_index=local_index, stats=stats,
+                                     sidecars=args.sidecars)
+        else:
+            pipeline.rename_stuff(args.directory, dry_run=args.dry_run, verify_online=args.verify_online,
+                                  cache=cache, workers=args.workers, rate=args.rate,
+                                  incremental=not args.full_scan, scan_workers=args.scan_workers,
+                                  plan_out=args.plan_out, jobs=args.jobs, local_index=local_index, stats=stats,
+                                  duplicates=args.duplicates, sidecars=args.sidecars,
+                                  refresh_sidecars=args.refresh_sidecars)
+    if args.stats == '-':
+        print("\n" + stats.report())
+    elif args.stats:
+        stats.save(args.stats)
+    if cache:
+        print(f"OMDb cache: {cache.hits} hits, {cache.misses} misses")
+        cache.close()
+    if local_index:
+        local_index.close()
+    return 0
+
+
+def run_files(args, parser):
+    cache = OmdbCache(args.cache) if not args.no_cache else None
+    files.rename_files_in_directory(args.directory, files.OMDB_API_KEY, dry_run=args.dry_run,
+                                    include_loose=args.include_loose, cache=cache, workers=args.workers,
+                                    rate=args.rate, plan_path=args.plan_out, jobs=args.jobs)
+    if cache:
+        cache.close()
+    return 0
+
+
+def run_tv(args, parser):
+    cache = OmdbCache(args.cache) if not (args.offline or args.no_cache) else None
+    tv.rename_episodes(args.directory, tv.OMDB_API_KEY, dry_run=args.dry_run, cache=cache, workers=args.workers,
+                       rate=args.rate, offline=args.offline, plan_path=args.plan_out)
+    if cache:
+        cache.close()
+    return 0
+
+
+def run_clean(args, parser):
+    rename_folders_and_files(args.directory, PROFILES[args.profile], args.scan_workers)
+    hits, misses, rate = parse_cache_info()
+    print(f"Name cache: {hits} hits, {misses} misses ({rate:.0%} hit rate)")
+    return 0
+
+
+def run_dupes(args, parser):
+    stats = Stats()
+    groups = library_duplicates(args.directory, stats)
+    for group in groups:
+        keeper = pick_keeper(group)
+        print(f"\n{os.path.relpath(keeper, args.directory)}")
+        for path in group:
+            if path != keeper:
+                print(f"  = {os.path.relpath(path, args.directory)}")
+    print(f"\n{len(groups)} group(s), {sum(len(group) - 1 for group in groups)} redundant copies")
+
+    plan = plan_quarantine(args.directory, groups)
+    if args.merge and plan.operations:
+        with Journal.for_run(plan.base_path) as journal:
+            apply_plan(plan, journal=journal, stats=stats)
+        if journal.count:
+            print(f"Moved {journal.count} file(s) to .duplicates/; journal saved to {journal.path}")
+    if args.stats:
+        print("\n" + stats.report())
+    return 0
+
+
+def run_undo(args, parser):
+    journal_path = latest_journal(args.target) if os.path.isdir(args.target) else args.target
+    if not journal_path:
+        parser.error(f"no journal found in {args.target}")
+    return undo(journal_path, args.dry_run)
+
+
+def run_index(args, parser):
+    imported = build_index(args.dump, args.index, tuple(args.types.split(',')))
+    print(f"Indexed {imported} titles into {args.index}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='movie_renamer', description="Clean up movie folder and file names.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    add_folders_parser(commands.add_parser(
+        'folders', help="Rename movie folders and their files, optionally verified against OMDb",
+        description="Rename movie folders & files with optional online verification."))
+    add_files_parser(commands.add_parser(
+        'files', help="Rename video and subtitle files in place using OMDb search results"))
+    add_tv_parser(commands.add_parser(
+        'tv', help="Rename TV episodes (S01E02, 1x02 or air date) with one OMDb lookup per show and season"))
+    add_clean_parser(commands.add_parser(
+        'clean', help="Rename movie folders offline with one of the original scripts' cleaning rules"))
+    add_dupes_parser(commands.add_parser(
+        'dupes', help="Find identical video files by size, sampled hash, then full hash"))
+    add_undo_parser(commands.add_parser('undo', help="Roll back a run from its journal"))
+    add_index_parser(commands.add_parser('index', help="Build the offline title index from an IMDb dump"))
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    return args.func(args, parser)
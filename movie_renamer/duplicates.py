@@ -0,0 +1,102 @@
+import hashlib
+import mmap
+import os
+from collections import defaultdict
+
+from movie_renamer.plan import PlanBuilder
+from movie_renamer.profiles import is_renamed
+from movie_renamer.scan import VIDEO, walk_media
+from movie_renamer.stats import Stats
+
+DUPLICATES_DIR = '.duplicates'
+CHUNK_SIZE = 1024 * 1024  # bytes sampled from the head, middle and tail of each file
+PARTIAL_SPAN = 3 * CHUNK_SIZE  # files up to this size are hashed whole by partial_hash
+READ_SIZE = 8 * 1024 * 1024
+
+
+def partial_hash(path, size) -> str:
+    # Hashes three chunks through mmap, so a multi-GB video costs 3 MiB of reads
+    digest = hashlib.blake2b(str(size).encode(), digest_size=16)
+    if size == 0:
+        return digest.hexdigest()
+    with open(path, 'rb') as media, mmap.mmap(media.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        if size <= PARTIAL_SPAN:
+            digest.update(view)
+        else:
+            middle = (size - CHUNK_SIZE) // 2
+            for offset in (0, middle, size - CHUNK_SIZE):
+                digest.update(view[offset:offset + CHUNK_SIZE])
+    return digest.hexdigest()
+
+
+def full_hash(path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    buffer = bytearray(READ_SIZE)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as media:
+        while True:
+            read = media.readinto(buffer)
+            if not read:
+                break
+            digest.update(view[:read])
+    return digest.hexdigest()
+
+
+def _regroup(paths, key):
+    groups = defaultdict(list)
+    for path in paths:
+        groups[key(path)].append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def find_duplicates(paths, stats=None):
+    # Returns groups of paths with identical content. Each stage only looks at
+    # files the cheaper stage before it could not tell apart:
+    # size -> head/middle/tail hash -> full hash
+    stats = stats or Stats()
+    sizes = {}
+    for path in dict.fromkeys(paths):
+        try:
+            sizes[path] = os.stat(path).st_size
+        except OSError:
+            continue
+
+    duplicates = []
+    with stats.stage('hash'):
+        for same_size in _regroup(sizes, sizes.get):
+            stats.count('hash_partial', len(same_size))
+            for same_sample in _regroup(same_size, lambda path: partial_hash(path, sizes[path])):
+                if sizes[same_sample[0]] <= PARTIAL_SPAN:
+                    duplicates.append(same_sample)
+                    continue
+                stats.count('hash_full', len(same_sample))
+                duplicates.extend(_regroup(same_sample, full_hash))
+    return [sorted(group) for group in duplicates]
+
+
+def pick_keeper(group):
+    # Prefer a copy that already sits under a clean "Title (Year)" folder, then the shortest path
+    def rank(path):
+        return not is_renamed(os.path.basename(os.path.dirname(path))), len(path), path
+    return min(group, key=rank)
+
+
+def library_duplicates(base_path, stats=None):
+    # Every video under base_path, grouped by identical content
+    skip = os.path.join(os.path.abspath(base_path), DUPLICATES_DIR) + os.sep
+    videos = [entry.path for entry in walk_media(os.path.abspath(base_path))
+              if entry.kind == VIDEO and not entry.path.startswith(skip)]
+    return find_duplicates(videos, stats)
+
+
+def plan_quarantine(base_path, groups):
+    # Keeps one copy per group and moves the rest under .duplicates/, keeping their relative paths
+    builder = PlanBuilder(base_path)
+    for group in groups:
+        keeper = os.path.relpath(pick_keeper(group), builder.base_path)
+        for path in group:
+            rel_path = os.path.relpath(path, builder.base_path)
+            if rel_path != keeper:
+                builder.add(rel_path, os.path.join(DUPLICATES_DIR, rel_path), 'duplicate',
+                            f"same content as {keeper}")
+    return builder.build()
@@ -0,0 +1,147 @@
+import os
+from pathlib import Path
+
+from movie_renamer.journal import Journal
+from movie_renamer.lookup import DEFAULT_RATE, DEFAULT_WORKERS, TokenBucket, resolve_deduplicated
+from movie_renamer.matching import best_candidate
+from movie_renamer.parallel import parse_all
+from movie_renamer.plan import PlanBuilder, apply_plan
+from movie_renamer.profiles import PROFILES
+from movie_renamer.scan import SUBTITLE, VIDEO, walk_media
+from movie_renamer.subtitles import SUBTITLE_SUFFIX, spread_subtitles
+
+OMDB_API_KEY = "6b03617a"
+OMDB_URL = os.environ.get("OMDB_URL", "http://www.omdbapi.com/")
+
+PROFILE = PROFILES['search']
+
+
+def clean_title(filename):
+    return PROFILE.clean(filename)
+
+
+def get_best_match(title, client, cache=None):
+    try:
+        cached, data = cache.get('s', title) if cache else (False, None)
+        if not cached:
+            data = client.get(s=title)
+            if cache:
+                cache.put('s', title, data)
+        if data.get("Response") == "True":
+            best = best_candidate(title, data.get("Search", []))
+            if best:
+                return f"{best['Title']} ({best['Year']})"
+    except Exception as e:
+        print(f"Error querying OMDb: {e}")
+    return None
+
+
+def subtitle_queries(files, jobs=1):
+    # Subtitles reuse the query of the video they belong to (same folder, and
+    # either the only video there or one whose stem starts the subtitle's),
+    # so only orphans are parsed; their language tags are dropped, and an
+    # orphan named after nothing but its language ("English.srt") gets None
+    video_names = list(dict.fromkeys(entry.name for entry in files if entry.kind == VIDEO))
+    cleaned = dict(zip(video_names, parse_all(clean_title, video_names, jobs)))
+
+    videos = {}
+    for entry in files:
+        if entry.kind == VIDEO:
+            videos.setdefault(os.path.dirname(entry.path), []).append((Path(entry.name).stem.lower(),
+                                                                       cleaned[entry.name]))
+
+    owners = []
+    for entry in files:
+        owner = None
+        if entry.kind == SUBTITLE:
+            stem = Path(entry.name).stem.lower()
+            siblings = videos.get(os.path.dirname(entry.path), [])
+            if len(siblings) == 1:
+                owner = siblings[0][1]
+            else:
+                owner = next((query for video_stem, query in siblings if stem.startswith(video_stem)), None)
+        owners.append(owner)
+
+    orphans = list(dict.fromkeys(entry.name for entry, owner in zip(files, owners)
+                                 if entry.kind == SUBTITLE and owner is None))
+    cleaned.update(zip(orphans, parse_all(clean_title, orphans, jobs)))
+
+    queries = []
+    for entry, owner in zip(files, owners):
+        query = cleaned.get(entry.name)
+        if entry.kind == SUBTITLE:
+            query = owner or SUBTITLE_SUFFIX.sub('', ' ' + query).strip() or None
+        queries.append(query)
+    return queries
+
+
+def plan_directory(directory, api_key, include_loose=False, cache=None,
+                   workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, jobs=1):
+    builder = PlanBuilder(directory)
+    files = []
+
+    top = os.path.normpath(directory)
+    for entry in walk_media(directory):
+        root = os.path.dirname(entry.path)
+        if root == top and not include_loose:
+            continue
+        files.append(entry)
+
+    pending = []
+    for entry, query in zip(files, subtitle_queries(files, jobs)):
+        rel_path = os.path.relpath(entry.path, top)
+        if not query:
+            print(f"No title in {entry.name}; skipping")
+            builder.skip(rel_path, "no title in name")
+            continue
+        pending.append((rel_path, os.path.splitext(entry.name)[1].lower(), query))
+    queries = [query for _, _, query in pending]
+
+    # Look up each distinct title once, concurrently, before touching the disk
+    from movie_renamer.omdb_client import OmdbClient
+
+    limiter = TokenBucket(rate) if rate else None
+    client = OmdbClient(api_key, OMDB_URL, pool_size=workers, limiter=limiter)
+    matches = resolve_deduplicated(queries, lambda query: get_best_match(query, client, cache), workers)
+    print(client.summary())
+    client.close()
+
+    renames = []
+    for (rel_path, ext, cleaned), omdb_title in zip(pending, matches):
+        if not omdb_title:
+            print(f"Could not find title for {os.path.basename(rel_path)}")
+            builder.skip(rel_path, "no OMDb match")
+            continue
+        renames.append((rel_path, os.path.join(os.path.dirname(rel_path), f"{omdb_title}{ext}")))
+
+    queries_by_path = {rel_path: cleaned for rel_path, _, cleaned in pending}
+    renames = spread_subtitles(renames)
+    builder.add_sources(rel_path for rel_path, _ in renames)
+    for rel_path, target in renames:
+        query = queries_by_path[rel_path]
+        if not builder.add(rel_path, target, 'file', f"OMDb match for '{query}'") and target != rel_path:
+            print(f"Skipping {os.path.basename(rel_path)}: '{os.path.basename(target)}' is already taken")
+
+    return builder.build()
+
+
+def rename_files_in_directory(directory, api_key, dry_run=True, include_loose=False, cache=None,
+                              workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, plan_path=None, jobs=1):
+    plan = plan_directory(directory, api_key, include_loose=include_loose, cache=cache, workers=workers, rate=rate,
+                          jobs=jobs)
+    if plan_path:
+        plan.save(plan_path)
+
+    if dry_run:
+        for op in plan.operations:
+            print(f"Would rename: {os.path.basename(op.source)} -> {os.path.basename(op.target)}")
+        return
+    if not plan.operations:
+        return
+
+    # Appended per rename instead of overwriting backup_log.txt at the end of every run
+    with Journal.for_run(plan.base_path) as journal:
+        for op in apply_plan(plan, journal=journal):
+            print(f"Renamed: {os.path.basename(op.source)} -> {os.path.basename(op.target)}")
+    if journal.count:
+        print(f"Journal saved to {journal.path}")
@@ -0,0 +1,99 @@
+import os
+from pathlib import Path
+
+from movie_renamer.journal import Journal
+from movie_renamer.plan import PlanBuilder, apply_plan
+from movie_renamer.profiles import is_renamed
+from movie_renamer.scan import SUBTITLE, VIDEO, scan_dir, scan_folders, walk_media
+
+
+def clean_leftovers(builder, profile, directory, names, subdirs=()):
+    # Leftover-junk stage for files no earlier stage renamed, plus everything below subdirs;
+    # directory is relative to the plan's base path
+    for name in names:
+        builder.add(os.path.join(directory, name), os.path.join(directory, profile.final_clean(name)), 'file')
+    for subdir in subdirs:
+        for entry in walk_media(os.path.join(builder.base_path, directory, subdir)):
+            rel_path = os.path.relpath(entry.path, builder.base_path)
+            builder.add(rel_path, os.path.join(os.path.dirname(rel_path), profile.final_clean(entry.name)), 'file')
+
+
+def plan_folders_and_files(base_dir, profile, workers=1):
+    # Local-only plan for "<release>/<video>" folders, driven by a cleaning profile.
+    # Every directory is listed once: the loose-file and leftover-junk stages
+    # reuse the folder pass's listings instead of walking the tree again
+    builder = PlanBuilder(base_dir)
+    entries = scan_dir(base_dir)
+    folders = []
+    untouched = []
+    for entry in entries:
+        if entry.is_dir and not entry.name.startswith('.'):  # .rename_journal, .duplicates
+            if profile.skip_renamed and is_renamed(entry.name):
+                print(f"Skipping already renamed folder: {entry.name}")
+                untouched.append((entry.name, entry.path))
+                continue
+            folders.append((entry.name, entry.path))
+
+    for listing in scan_folders(folders, workers):
+        folder = listing.name
+        videos = listing.videos
+        movie_file = (videos[0] if profile.first_video else videos[-1]) if videos else None
+        subtitle_file = listing.subtitles[-1] if profile.subtitles and listing.subtitles else None
+        builder.add_sources(os.path.join(folder, name) for name in listing.videos + listing.subtitles)
+        renamed = set()
+
+        if movie_file:
+            parsed = profile.parse(movie_file)
+            if parsed.name != folder and not builder.add(folder, parsed.name, 'folder', f"from {movie_file}"):
+                continue
+
+            # Files are renamed inside the old folder, straight to the final name
+            # (ParsedName.final): the leftover stage would otherwise rename them again
+            builder.add(os.path.join(folder, movie_file),
+                        os.path.join(folder, parsed.final + Path(movie_file).suffix), 'movie')
+            renamed.add(movie_file)
+            if subtitle_file:
+                builder.add(os.path.join(folder, subtitle_file), os.path.join(folder, parsed.final + '.srt'),
+                            'subtitle')
+                renamed.add(subtitle_file)
+        elif profile.subtitles:
+            print(f"No movie file found in: {listing.path}")
+
+        if profile.final_pass:
+            rest = [name for name in listing.videos + listing.subtitles if name not in renamed]
+            clean_leftovers(builder, profile, folder, rest, listing.subdirs)
+
+    if profile.final_pass:
+        for listing in scan_folders(untouched, workers):
+            clean_leftovers(builder, profile, listing.name, listing.videos + listing.subtitles, listing.subdirs)
+
+    # Loose files come from the first listing: renaming folders does not add or remove them
+    builder.add_sources(entry.name for entry in entries if entry.kind in (VIDEO, SUBTITLE))
+    for entry in entries:
+        if entry.kind == VIDEO and profile.loose_files:
+            builder.add(entry.name, profile.parse(entry.name).final + Path(entry.name).suffix, 'movie')
+        elif entry.kind in (VIDEO, SUBTITLE) and profile.final_pass:
+            clean_leftovers(builder, profile, '', [entry.name])
+
+    return builder.build()
+
+
+def rename_folders_and_files(base_dir, profile, workers=1):
+    plan = plan_folders_and_files(base_dir, profile, workers)
+    for conflict in plan.conflicts:
+        print(f"Skipping {conflict.source}: {conflict.reason}")
+    if not plan.operations:
+        return plan
+
+    # Journaled and applied one transaction group at a time, like every other rename
+    with Journal.for_run(plan.base_path) as journal:
+        for op in apply_plan(plan, journal=journal):
+            if op.kind == 'folder':
+                print(f"Renamed: {op.source} -> {op.target}")
+            elif op.kind == 'movie' and os.sep not in op.source:
+                print(f"Renamed loose file: {op.source} -> {op.target}")
+            elif op.kind == 'file':
+                print(f"Cleaned leftover: {os.path.basename(op.source)} -> {os.path.basename(op.target)}")
+    if journal.count:
+        print(f"Journal saved to {journal.path}")
+    return plan
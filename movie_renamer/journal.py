@@ -0,0 +1,159 @@
+import base64
+import json
+import os
+import time
+
+from movie_renamer.plan import prune_empty_parents, rename_path, same_file
+
+JOURNAL_DIR = '.rename_journal'
+
+
+class Journal:
+    # Append-only JSON-lines record of renames, flushed as each one happens.
+    # The file is only created by the first record, so a run that changes nothing leaves none
+    def __init__(self, path=None, fsync=False, directory=None):
+        self.path = path  # None for a per-run journal until its first record names it
+        self.fsync = fsync
+        self.directory = directory
+        self.count = 0
+        self._file = None
+
+    @classmethod
+    def for_run(cls, base_path, **kwargs) -> 'Journal':
+        return cls(directory=os.path.join(base_path, JOURNAL_DIR), **kwargs)
+
+    def _open(self):
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            return open(self.path, 'a', encoding='utf-8')
+        # Each run gets its own file, even two runs of one process within the same
+        # second (watch mode); the fixed-width serial keeps names sorting by age
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S') + f'-{os.getpid()}'
+        serial = 0
+        while True:
+            path = os.path.join(self.directory, f'{stamp}-{serial:03d}.jsonl')
+            try:
+                journal_file = open(path, 'x', encoding='utf-8')
+            except FileExistsError:
+                serial += 1
+                continue
+            self.path = path
+            return journal_file
+
+    def _write(self, entry):
+        if self._file is None:
+            self._file = self._open()
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+        self.count += 1
+
+    def record(self, old, new, kind=''):
+        self._write({'ts': time.time(), 'old': os.path.abspath(old), 'new': os.path.abspath(new), 'kind': kind})
+
+    def record_write(self, path, previous=None, kind='sidecar'):
+        # A file the run wrote; undo restores the previous bytes, or removes a file that did not exist
+        self._write({'ts': time.time(), 'old': None, 'new': os.path.abspath(path), 'kind': kind,
+                     'previous': base64.b64encode(previous).decode('ascii') if previous is not None else None})
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def latest_journal(base_path):
+    journal_dir = os.path.join(base_path, JOURNAL_DIR)
+    try:
+        names = sorted(name for name in os.listdir(journal_dir) if name.endswith('.jsonl'))
+    except FileNotFoundError:
+        return None
+    return os.path.join(journal_dir, names[-1]) if names else None
+
+
+def _lines_reversed(path, block_size=64 * 1024):
+    # Reads the file backwards block by block, so memory stays bounded
+    with open(path, 'rb') as journal_file:
+        journal_file.seek(0, os.SEEK_END)
+        position = journal_file.tell()
+        remainder = b''
+        while position > 0:
+            size = min(block_size, position)
+            position -= size
+            journal_file.seek(position)
+            lines = (journal_file.read(size) + remainder).split(b'\n')
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                if line.strip():
+                    yield line
+        if remainder.strip():
+            yield remainder
+
+
+def read_reversed(path):
+    for line in _lines_reversed(path):
+        try:
+            yield json.loads(line)
+        except ValueError:
+            # Torn final line from a crash mid-write; that rename may not have happened
+            continue
+
+
+def _undo_write(entry, dry_run=False) -> bool:
+    new, previous = entry['new'], entry.get('previous')
+    if dry_run:
+        print(f"Would {'restore' if previous is not None else 'remove'}: {new}")
+        return True
+    try:
+        if previous is None:
+            os.remove(new)
+        else:
+            with open(new, 'wb') as restored:
+                restored.write(base64.b64decode(previous))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"Failed to undo write of {new}: {e}")
+        return False
+    return True
+
+
+def undo_journal(path, dry_run=False):
+    # Replays a journal newest-first, moving every file back to its old name
+    undone = 0
+    failed = 0
+    for entry in read_reversed(path):
+        old, new = entry['old'], entry['new']
+        if old is None:
+            if _undo_write(entry, dry_run):
+                undone += 1
+            else:
+                failed += 1
+            continue
+        # A case-only rename ("up" -> "Up") leaves old "existing" on case-insensitive filesystems
+        if not os.path.lexists(new) or (os.path.lexists(old) and not same_file(new, old)):
+            print(f"Cannot undo {new} -> {old}: source missing or destination taken")
+            failed += 1
+            continue
+        if dry_run:
+            print(f"Would restore: {new} -> {old}")
+        else:
+            try:
+                rename_path(new, old)
+            except OSError as e:
+                print(f"Failed to restore {new} -> {old}: {e}")
+                failed += 1
+                continue
+            prune_empty_parents(new, old)
+        undone += 1
+
+    if not dry_run and not failed:
+        os.replace(path, path + '.undone')
+    return undone, failed
@@ -0,0 +1,114 @@
+import argparse
+import csv
+import gzip
+import os
+import re
+import sqlite3
+import sys
+import unicodedata
+
+from movie_renamer.matching import split_year
+
+DEFAULT_TITLE_TYPES = ('movie', 'tvMovie', 'tvSeries', 'tvMiniSeries', 'video')
+BATCH_SIZE = 50000
+
+
+def title_key(title: str) -> str:
+    # 'Amélie: Le Fabuleux...' -> 'amelie le fabuleux'
+    decomposed = unicodedata.normalize('NFKD', title)
+    ascii_title = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(re.findall(r'[a-z0-9]+', ascii_title.lower()))
+
+
+def _open_dump(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def build_index(tsv_path, index_path, title_types=DEFAULT_TITLE_TYPES):
+    # Imports an IMDb title.basics TSV dump into a compact SQLite lookup table
+    if os.path.exists(index_path):
+        os.remove(index_path)
+    db = sqlite3.connect(index_path)
+    db.execute("PRAGMA journal_mode = OFF")
+    db.execute("PRAGMA synchronous = OFF")
+    db.execute("CREATE TABLE titles (key TEXT NOT NULL, title TEXT NOT NULL, year INTEGER, type TEXT NOT NULL)")
+
+    wanted = set(title_types)
+    count = 0
+    batch = []
+    with _open_dump(tsv_path) as dump:
+        reader = csv.DictReader(dump, delimiter='\t', quoting=csv.QUOTE_NONE)
+        for row in reader:
+            if row['titleType'] not in wanted or row.get('isAdult') == '1':
+                continue
+            year = int(row['startYear']) if row['startYear'].isdigit() else None
+            title = row['primaryTitle']
+            keys = {title_key(title), title_key(row['originalTitle'])}
+            batch.extend((key, title, year, row['titleType']) for key in keys if key)
+            count += 1
+            if len(batch) >= BATCH_SIZE:
+                db.executemany("INSERT INTO titles VALUES (?, ?, ?, ?)", batch)
+                batch.clear()
+
+    db.executemany("INSERT INTO titles VALUES (?, ?, ?, ?)", batch)
+    # Built after the bulk insert, which is much faster than maintaining it row by row
+    db.execute("CREATE INDEX titles_key_year ON titles (key, year)")
+    db.commit()
+    db.execute("VACUUM")
+    db.close()
+    return count
+
+
+class LocalIndex:
+    def __init__(self, index_path):
+        self._db = sqlite3.connect(f'file:{index_path}?mode=ro', uri=True, check_same_thread=False)
+
+    def _find(self, key, year):
+        if year:
+            # Same year first, then the nearest one; films before series
+            row = self._db.execute(
+                "SELECT title, year FROM titles WHERE key = ? AND year IS NOT NULL "
+                "ORDER BY abs(year - ?), type != 'movie' LIMIT 1",
+                (key, year)
+            ).fetchone()
+        else:
+            row = self._db.execute(
+                "SELECT title, year FROM titles WHERE key = ? AND year IS NOT NULL "
+                "ORDER BY type != 'movie', year DESC LIMIT 1",
+                (key,)
+            ).fetchone()
+        return row
+
+    def lookup(self, query: str):
+        # Returns 'Title (Year)' like fetch_omdb_title, or None
+        title, year = split_year(query)
+        tokens = title_key(title).split()
+
+        row = self._find(' '.join(tokens), year)
+        if not row and year:
+            # Leftover junk after the title ('Directors Cut', group names):
+            # drop trailing words, but then insist on the exact year
+            for end in range(len(tokens) - 1, 0, -1):
+                row = self._find(' '.join(tokens[:end]), year)
+                if row and row[1] == year:
+                    break
+                row = None
+
+        return f"{row[0]} ({row[1]})" if row else None
+
+    def close(self):
+        self._db.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Build an offline title index from an IMDb title.basics dump.")
+    parser.add_argument('dump', help="Path to title.basics.tsv or title.basics.tsv.gz")
+    parser.add_argument('index', help="SQLite index file to create")
+    parser.add_argument('--types', default=','.join(DEFAULT_TITLE_TYPES),
+                        help="Comma-separated titleType values to keep")
+    args = parser.parse_args()
+
+    imported = build_index(args.dump, args.index, tuple(args.types.split(',')))
+    print(f"Indexed {imported} titles into {args.index}", file=sys.stderr)
@@ -0,0 +1,53 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from movie_renamer.omdb_cache import normalize_query
+
+DEFAULT_WORKERS = 8
+DEFAULT_RATE = 10.0  # requests per second
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        # Blocks until a token is available; called right before each HTTP request
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def resolve_all(queries, resolve, workers=DEFAULT_WORKERS):
+    # Resolve each distinct query once on a bounded thread pool and return {query: result}
+    unique = list(dict.fromkeys(queries))
+    if workers <= 1 or len(unique) <= 1:
+        return {query: resolve(query) for query in unique}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return dict(zip(unique, pool.map(resolve, unique)))
+
+
+def resolve_deduplicated(queries, resolve, workers=DEFAULT_WORKERS, key=normalize_query):
+    # Queries that normalise to the same key are resolved once; the answer is
+    # fanned back out as a list aligned with the input
+    keys = [key(query) for query in queries]
+    representatives = {}
+    for query_key, query in zip(keys, queries):
+        representatives.setdefault(query_key, query)
+
+    results = resolve_all(list(representatives.values()), resolve, workers)
+    by_key = {query_key: results[query] for query_key, query in representatives.items()}
+    return [by_key[query_key] for query_key in keys]
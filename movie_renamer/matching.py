@@ -0,0 +1,77 @@
+import re
+from functools import lru_cache
+
+YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+
+# Weights of the two similarity measures, plus the year adjustment. The year terms are large enough
+# that 'The Lord of the Rings 2001' prefers the 2001 film over the 1978 one with the exact title
+TRIGRAM_WEIGHT = 0.6
+TOKEN_WEIGHT = 0.4
+YEAR_MATCH_BONUS = 0.25
+YEAR_NEAR_BONUS = 0.05
+YEAR_MISMATCH_PENALTY = 0.25
+
+
+def split_year(query: str):
+    # 'The Matrix 1999' -> ('The Matrix', 1999); the last year wins, like the cleaners
+    years = YEAR.findall(query)
+    if not years:
+        return query, None
+    year = years[-1]
+    index = query.rfind(year)
+    title = (query[:index] + query[index + len(year):]).strip()
+    return (title or query), int(year)
+
+
+@lru_cache(maxsize=16384)
+def features(text: str):
+    # Lowercased alphanumeric tokens and padded character trigrams, as frozensets
+    # so similarity is plain C-level set arithmetic
+    tokens = tuple(re.findall(r'[a-z0-9]+', text.lower()))
+    padded = f"  {' '.join(tokens)} "
+    trigrams = frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(tokens), trigrams
+
+
+def _jaccard(a, b):
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _candidate_year(candidate):
+    match = re.match(r'\d{4}', str(candidate.get('Year', '')))
+    return int(match.group(0)) if match else None
+
+
+def rank_candidates(query: str, candidates, year=None):
+    # Returns [(score, candidate), ...] best first. The query's features are
+    # computed once and reused for every candidate
+    title, query_year = split_year(query)
+    year = year or query_year
+    query_tokens, query_trigrams = features(title)
+
+    scored = []
+    for candidate in candidates:
+        tokens, trigrams = features(candidate.get('Title', ''))
+        score = TRIGRAM_WEIGHT * _jaccard(query_trigrams, trigrams) + TOKEN_WEIGHT * _jaccard(query_tokens, tokens)
+
+        candidate_year = _candidate_year(candidate)
+        if year and candidate_year:
+            if candidate_year == year:
+                score += YEAR_MATCH_BONUS
+            elif abs(candidate_year - year) == 1:
+                score += YEAR_NEAR_BONUS
+            else:
+                score -= YEAR_MISMATCH_PENALTY
+        scored.append((score, candidate))
+
+    scored.sort(key=lambda item: item[0], reverse=True)
+    return scored
+
+
+def best_candidate(query: str, candidates, year=None):
+    ranked = rank_candidates(query, candidates, year)
+    if ranked and ranked[0][0] > 0:
+        return ranked[0][1]
+    return None
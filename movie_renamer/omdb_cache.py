@@ -0,0 +1,77 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'movie-renamer', 'omdb.sqlite')
+
+# Positive answers rarely change; misses are retried sooner in case OMDb adds the title
+HIT_TTL = 30 * 24 * 3600
+MISS_TTL = 3 * 24 * 3600
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r'\s+', ' ', query).strip().lower()
+
+
+def is_cacheable_miss(data: dict) -> bool:
+    # Only cache definitive "not found" answers, never rate-limit or key errors
+    return data.get("Response") == "False" and data.get("Error", '').endswith("not found!")
+
+
+class OmdbCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, hit_ttl=HIT_TTL, miss_ttl=MISS_TTL):
+        self.path = path
+        self.hit_ttl = hit_ttl
+        self.miss_ttl = miss_ttl
+        self.hits = 0
+        self.misses = 0
+
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " kind TEXT NOT NULL,"
+            " query TEXT NOT NULL,"
+            " found INTEGER NOT NULL,"
+            " payload TEXT NOT NULL,"
+            " stored_at REAL NOT NULL,"
+            " PRIMARY KEY (kind, query))"
+        )
+        self._db.commit()
+
+    def get(self, kind: str, query: str):
+        # Returns (True, data) for a fresh entry, (False, None) when OMDb must be asked
+        with self._lock:
+            row = self._db.execute(
+                "SELECT found, payload, stored_at FROM responses WHERE kind = ? AND query = ?",
+                (kind, normalize_query(query))
+            ).fetchone()
+            if row:
+                found, payload, stored_at = row
+                ttl = self.hit_ttl if found else self.miss_ttl
+                if time.time() - stored_at < ttl:
+                    self.hits += 1
+                    return True, json.loads(payload)
+
+            self.misses += 1
+            return False, None
+
+    def put(self, kind: str, query: str, data: dict):
+        found = data.get("Response") == "True"
+        if not found and not is_cacheable_miss(data):
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (kind, query, found, payload, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, normalize_query(query), int(found), json.dumps(data), time.time())
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
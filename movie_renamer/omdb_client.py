@@ -0,0 +1,81 @@
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from movie_renamer.lookup import DEFAULT_WORKERS
+
+OMDB_URL = "http://www.omdbapi.com/"
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_DELAY = 30.0  # a server asking for longer is treated as down rather than stalling a worker
+
+
+class OmdbClient:
+    def __init__(self, api_key, url=OMDB_URL, timeout=5, retries=3, backoff=0.5,
+                 pool_size=DEFAULT_WORKERS, limiter=None, max_delay=MAX_RETRY_DELAY):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.limiter = limiter
+
+        # One keep-alive session shared by all worker threads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.requests = 0
+        self.retried = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, latency, retried=False, failed=False):
+        with self._lock:
+            self.requests += 1
+            self.total_latency += latency
+            self.retried += int(retried)
+            self.failures += int(failed)
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), self.max_delay)
+        return min(self.backoff * (2 ** attempt), self.max_delay)
+
+    def get(self, **params) -> dict:
+        params['apikey'] = self.api_key
+        for attempt in range(self.retries + 1):
+            if self.limiter:
+                self.limiter.acquire()
+            last_attempt = attempt == self.retries
+            start = time.perf_counter()
+            try:
+                response = self.session.get(self.url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                self._record(time.perf_counter() - start, retried=not last_attempt, failed=last_attempt)
+                if last_attempt:
+                    raise
+                time.sleep(self._retry_delay(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                self._record(time.perf_counter() - start, retried=True)
+                time.sleep(self._retry_delay(attempt, response))
+                continue
+
+            self._record(time.perf_counter() - start, failed=not response.ok)
+            response.raise_for_status()
+            return response.json()
+
+    def summary(self) -> str:
+        average = self.total_latency / self.requests * 1000 if self.requests else 0.0
+        return (f"OMDb: {self.requests} requests, {self.retried} retries, "
+                f"{self.failures} failures, {average:.0f} ms average latency")
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,22 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+MIN_CHUNK_SIZE = 64  # below this many names per worker, starting processes costs more than it saves
+CHUNKS_PER_WORKER = 4
+
+
+def parse_all(func, names, jobs=1, chunksize=None):
+    # Applies a pure parsing function (e.g. clean_title) to every name and
+    # returns the results in input order, so the plan is identical to a serial run.
+    # func must be a module-level function so it can be sent to worker processes.
+    # Chunks are sized so every worker gets a few of them, whatever the run size
+    names = list(names)
+    if jobs == 0:
+        jobs = os.cpu_count() or 1
+    if jobs <= 1 or len(names) < jobs * MIN_CHUNK_SIZE:
+        return [func(name) for name in names]
+
+    chunksize = chunksize or max(1, math.ceil(len(names) / (jobs * CHUNKS_PER_WORKER)))
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(func, names, chunksize=chunksize))
@@ -0,0 +1,377 @@
+import os
+from pathlib import Path
+
+from movie_renamer.duplicates import DUPLICATES_DIR, find_duplicates
+from movie_renamer.journal import Journal
+from movie_renamer.lookup import DEFAULT_RATE, DEFAULT_WORKERS, TokenBucket, resolve_all
+from movie_renamer.parallel import parse_all
+from movie_renamer.plan import PlanBuilder, apply_plan
+from movie_renamer.profiles import PROFILES, is_renamed, parse_cache_info
+from movie_renamer.scan import VIDEO, scan_dir, scan_folder, scan_folders
+from movie_renamer.sidecars import write_sidecars
+from movie_renamer.state_index import TARGET_EXISTS, StateIndex
+from movie_renamer.stats import Stats
+from movie_renamer.subtitles import subtitle_targets
+from movie_renamer.watch import DEFAULT_SETTLE, Watcher
+
+OMDB_API_KEY = "6b03617a"
+OMDB_URL = os.environ.get("OMDB_URL", "http://www.omdbapi.com/")
+
+PROFILE = PROFILES['advanced']
+
+
+def clean_title(raw):
+    return PROFILE.clean(raw)
+
+
+def fetch_omdb_record(raw_title, client, cache=None):
+    # The whole OMDb title payload (plot, cast, ratings...), or None without a match
+    title_guess = clean_title(raw_title)
+    try:
+        cached, data = cache.get('t', title_guess) if cache else (False, None)
+        if not cached:
+            data = client.get(t=title_guess)
+            if cache:
+                cache.put('t', title_guess, data)
+        if data.get("Response") == "True":
+            return data
+    except Exception as e:
+        print(f"OMDb request failed for '{title_guess}': {e}")
+    return None
+
+
+def omdb_name(data):
+    return f"{data.get('Title')} ({data.get('Year')})" if data else None
+
+
+def fetch_omdb_title(raw_title, client, cache=None):
+    return omdb_name(fetch_omdb_record(raw_title, client, cache))
+
+
+def fetch_omdb_folder(folder, client, cache=None):
+    # Payload for a folder already named "Title (Year)", asked for by exact title and year
+    title, year = folder[:-len(' (0000)')], folder[-len('0000)'):-1]
+    try:
+        cached, data = cache.get('ty', folder) if cache else (False, None)
+        if not cached:
+            data = client.get(t=title, y=year)
+            if cache:
+                cache.put('ty', folder, data)
+        if data.get("Response") == "True":
+            return data
+    except Exception as e:
+        print(f"OMDb request failed for '{folder}': {e}")
+    return None
+
+
+def library_metadata(base_path, cache=None, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, skip=()):
+    # {folder path: OMDb payload} for every "Title (Year)" folder not in skip
+    folders = [entry.name for entry in scan_dir(base_path)
+               if entry.is_dir and is_renamed(entry.name) and entry.path not in skip]
+    if not folders:
+        return {}
+    from movie_renamer.omdb_client import OmdbClient
+
+    limiter = TokenBucket(rate) if rate else None
+    client = OmdbClient(OMDB_API_KEY, OMDB_URL, pool_size=workers, limiter=limiter)
+    records = resolve_all(folders, lambda folder: fetch_omdb_folder(folder, client, cache), workers)
+    print(client.summary())
+    client.close()
+    return {os.path.join(base_path, folder): data for folder, data in records.items() if data}
+
+
+def scan_candidates(base_path, state=None, scan_workers=1, stats=None, only=None):
+    # Returns ({folder: (movie_file, subs, stat)}, [(folder, folder_path)], unchanged count,
+    # [loose video]). When nothing was added or removed under base_path, only the
+    # folders left untouched last time need looking at again
+    stats = stats or Stats()
+    loose = []
+    if state and state.base_unchanged():
+        candidates = [(folder, os.path.join(base_path, folder)) for folder in state.known_folders()]
+    else:
+        candidates = []
+        for entry in scan_dir(base_path):
+            if entry.name.startswith('.') or (only is not None and entry.name not in only):
+                continue
+            if only is not None and entry.kind == VIDEO:
+                # A download that is a bare video file (watch mode) is renamed in place
+                loose.append(entry.name)
+                continue
+            if is_renamed(entry.name) or not entry.is_dir:
+                print(f"Skipping: {entry.name}")
+                stats.count('skipped')
+                continue
+            candidates.append((entry.name, entry.path))
+
+    stats.count('folders', len(candidates))
+    listings = {}
+    to_scan = []
+    unchanged = 0
+    for folder, folder_path in candidates:
+        st = None
+        if state:
+            try:
+                st = os.stat(folder_path)
+            except FileNotFoundError:
+                continue
+            entry = state.lookup(folder, st)
+            if entry:
+                unchanged += 1
+                stats.count('unchanged')
+                listings[folder] = (entry['movie_file'], entry['subs'], st)
+                continue
+        to_scan.append((folder, folder_path, st))
+
+    scanned = scan_folders([(folder, folder_path) for folder, folder_path, _ in to_scan], scan_workers)
+    for listing, (_, _, st) in zip(scanned, to_scan):
+        movie_file = listing.videos[-1] if listing.videos else None
+        listings[listing.name] = (movie_file, listing.subtitles, st)
+
+    return listings, candidates, unchanged, loose
+
+
+def plan_renames(base_path, verify_online=False, cache=None, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                 state=None, scan_workers=1, jobs=1, local_index=None, stats=None, only=None,
+                 duplicates=None, metadata=None):
+    # metadata, when given, is filled with {target folder: OMDb payload} for online lookups
+    stats = stats or Stats()
+    builder = PlanBuilder(base_path)
+    pending = []
+    settled = 0
+
+    with stats.stage('scan'):
+        listings, candidates, unchanged, loose = scan_candidates(base_path, state, scan_workers, stats, only)
+
+    for folder, folder_path in candidates:
+        if folder not in listings:
+            continue
+        movie_file, subs, st = listings[folder]
+
+        if not movie_file:
+            print(f"No movie file found in: {folder}")
+            stats.count('no_movie')
+            builder.skip(folder, "no movie file")
+            if state:
+                state.record(folder, st, movie_file, subs, "no movie file")
+            continue
+
+        decision = state.settled_decision(folder, st) if state and not duplicates else None
+        if decision:
+            # Same folder, same taken target: no need to clean or look it up again
+            settled += 1
+            stats.count('settled')
+            builder.skip(folder, "target already exists", decision[len(TARGET_EXISTS):])
+            state.record(folder, st, movie_file, subs, decision)
+            continue
+
+        pending.append((folder, movie_file, subs, st))
+    pending.extend((None, name, [], None) for name in loose)
+
+    if unchanged:
+        print(f"{unchanged} folder(s) unchanged since last scan; reused their listing")
+    if settled:
+        print(f"{settled} folder(s) still blocked by an existing target; skipped")
+
+    hits_before, misses_before, _ = parse_cache_info()
+    # Resolve every pending title up front so OMDb round-trips overlap
+    raw_names = [os.path.splitext(movie_file)[0] for _, movie_file, _, _ in pending]
+    unique = list(dict.fromkeys(raw_names))
+    if verify_online:
+        # Imported here so local-only runs never load the HTTP stack
+        from movie_renamer.omdb_client import OmdbClient
+
+        limiter = TokenBucket(rate) if rate else None
+        client = OmdbClient(OMDB_API_KEY, OMDB_URL, pool_size=workers, limiter=limiter)
+        with stats.stage('lookup'):
+            records = resolve_all(raw_names, lambda raw: fetch_omdb_record(raw, client, cache), workers)
+        new_names = {raw: omdb_name(data) for raw, data in records.items()}
+        if metadata is not None:
+            for raw, data in records.items():
+                if data:
+                    metadata[new_names[raw]] = data
+                    if cache:
+                        # Lets a later --refresh-sidecars run find it by folder name without asking OMDb
+                        cache.put('ty', new_names[raw], data)
+        print(client.summary())
+        stats.count('requests', client.requests)
+        stats.count('retries', client.retried)
+        if cache:
+            stats.count('cache_hit', cache.hits)
+            stats.count('cache_miss', cache.misses)
+        client.close()
+    elif local_index:
+        with stats.stage('clean'):
+            guesses = parse_all(clean_title, unique, jobs)
+        with stats.stage('lookup'):
+            new_names = {raw: local_index.lookup(guess) for raw, guess in zip(unique, guesses)}
+    else:
+        with stats.stage('clean'):
+            new_names = dict(zip(unique, parse_all(clean_title, unique, jobs)))
+    stats.count('titles', len(unique))
+    hits, misses, _ = parse_cache_info()
+    stats.count('parse_cache_hit', hits - hits_before)
+    stats.count('parse_cache_miss', misses - misses_before)
+
+    with stats.stage('plan'):
+        plan = build_plan(builder, pending, new_names, state, stats, duplicates)
+    stats.count('conflicts', len(plan.conflicts))
+    return plan
+
+
+def build_plan(builder, pending, new_names, state=None, stats=None, duplicates=None):
+    stats = stats or Stats()
+    movies = {}
+    collisions = []
+    for folder, movie_file, subs, st in pending:
+        new_name = new_names[os.path.splitext(movie_file)[0]]
+        if folder is None:
+            # Loose video: renamed in place next to the release folders
+            target = new_name + Path(movie_file).suffix if new_name else None
+            if not target:
+                print(f"Could not determine new name for {movie_file}. Skipping.")
+                stats.count('unresolved')
+                builder.skip(movie_file, "unresolved")
+            elif target != movie_file and not builder.add(movie_file, target, 'movie'):
+                print(f"Target file '{target}' already exists. Skipping.")
+            continue
+
+        if not new_name:
+            print(f"Could not determine new name for {folder}. Skipping.")
+            stats.count('unresolved')
+            builder.skip(folder, "unresolved")
+            if state:
+                state.record(folder, st, movie_file, subs, "unresolved")
+            continue
+
+        if new_name == folder or not builder.add(folder, new_name, 'folder', f"from {movie_file}"):
+            if new_name == folder:
+                builder.skip(folder, "target already exists", new_name)
+            else:
+                collisions.append((folder, movie_file, new_name))
+            print(f"Target folder '{new_name}' already exists. Skipping.")
+            if state:
+                state.record(folder, st, movie_file, subs, TARGET_EXISTS + new_name)
+            continue
+
+        movies[folder] = movie_file
+        if state:
+            # Kept until the rename is applied, so a failed or rolled-back one is revisited next run
+            state.record(folder, st, movie_file, subs, "planned")
+        # Files are renamed inside the old folder; apply_plan runs them before the folder itself
+        builder.add_sources(os.path.join(folder, name) for name in [movie_file] + subs)
+        builder.add(os.path.join(folder, movie_file), os.path.join(folder, new_name + Path(movie_file).suffix),
+                    'movie')
+        # Several subtitles keep their language tag instead of competing for one name
+        for sub, target in zip(subs, subtitle_targets(new_name, subs)):
+            builder.add(os.path.join(folder, sub), os.path.join(folder, target), 'subtitle')
+
+    if duplicates and collisions:
+        with stats.stage('duplicates'):
+            check_duplicates(builder, collisions, movies, duplicates == 'merge', stats)
+    return builder.build()
+
+
+def check_duplicates(builder, collisions, movies, merge=False, stats=None):
+    # A folder that lost its target to another copy of the same movie is reported,
+    # or with merge moved under .duplicates/ (journaled, so --undo brings it back)
+    stats = stats or Stats()
+    for folder, movie_file, new_name in collisions:
+        base = builder.base_path
+        keeper = builder.claimant(new_name)
+        if keeper:
+            keeper_videos = [os.path.join(keeper, movies[keeper])]
+        else:
+            keeper = new_name
+            keeper_videos = [os.path.join(new_name, video)
+                             for video in scan_folder(new_name, os.path.join(base, new_name)).videos]
+
+        source = os.path.join(base, folder, movie_file)
+        groups = find_duplicates([source] + [os.path.join(base, video) for video in keeper_videos], stats)
+        if not any(source in group for group in groups):
+            continue
+
+        stats.count('duplicates')
+        print(f"Duplicate: '{folder}' holds the same movie as '{keeper}'")
+        if merge:
+            builder.add(folder, os.path.join(DUPLICATES_DIR, folder), 'duplicate', f"same content as {keeper}")
+
+
+def apply_renames(plan, stats=None, journal=None):
+    if not plan.operations:
+        return []
+    stats = stats or Stats()
+    if journal is None:
+        with Journal.for_run(plan.base_path) as journal:
+            return apply_renames(plan, stats, journal)
+    # Every rename is appended to the journal as it happens, so a crash
+    # mid-run still leaves a complete record for --undo
+    with stats.stage('rename'):
+        applied = apply_plan(plan, journal=journal, stats=stats)
+    if journal.count:
+        print(f"\n📄 {journal.count} rename(s) journaled to {journal.path}")
+    return applied
+
+
+def rename_stuff(base_path, dry_run=False, verify_online=False, cache=None,
+                 workers=DEFAULT_WORKERS, rate=DEFAULT_RATE, incremental=True, scan_workers=1, plan_out=None,
+                 jobs=1, local_index=None, stats=None, only=None, duplicates=None, sidecars=None,
+                 refresh_sidecars=False):
+    stats = stats or Stats()
+    state = StateIndex(base_path) if incremental else None
+    metadata = {} if sidecars else None
+    plan = plan_renames(base_path, verify_online=verify_online, cache=cache, workers=workers, rate=rate,
+                        state=state, scan_workers=scan_workers, jobs=jobs, local_index=local_index, stats=stats,
+                        only=only, duplicates=duplicates, metadata=metadata)
+
+    for op in plan.operations:
+        if op.kind == 'folder':
+            print(f"\n==> Rename folder: '{op.source}' → '{op.target}'")
+
+    if plan_out:
+        plan.save(plan_out)
+        print(f"\n📄 Plan saved to {plan_out}")
+
+    if dry_run:
+        if metadata:
+            print(f"\nWould write sidecars ({sidecars}) for {len(metadata)} folder(s)")
+        if sidecars and refresh_sidecars:
+            print("Would refresh sidecars in every 'Title (Year)' folder")
+        return plan
+
+    with Journal.for_run(base_path) as journal:
+        applied = apply_renames(plan, stats, journal)
+        if sidecars:
+            # Sidecars go into folders that now carry their new name, all in one batch
+            folders = {os.path.join(base_path, op.target): metadata[op.target]
+                       for op in applied if op.kind == 'folder' and op.target in metadata}
+            if refresh_sidecars:
+                with stats.stage('lookup'):
+                    folders.update(library_metadata(base_path, cache, workers, rate, skip=folders))
+            written, unchanged = write_sidecars(folders, sidecars, stats, journal)
+            print(f"📝 {written} sidecar(s) written, {unchanged} unchanged")
+    if state:
+        for op in applied:
+            if op.kind == 'folder':
+                state.forget(op.source)
+        state.save()
+    return plan
+
+
+def watch_directory(base_path, settle=DEFAULT_SETTLE, **options):
+    # Daemon mode: rename each new download once it stops growing, touching only that folder
+    produced = set()
+
+    def on_ready(name):
+        if name in produced:
+            # Our own rename showing up as a new entry
+            produced.discard(name)
+            return
+        print(f"\n👀 Download settled: {name}")
+        plan = rename_stuff(base_path, incremental=False, only={name}, **options)
+        produced.update(op.target for op in plan.operations if os.sep not in op.target)
+
+    print(f"Watching {base_path} for new downloads (Ctrl+C to stop)")
+    try:
+        Watcher(base_path, on_ready, settle=settle).run()
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
@@ -0,0 +1,281 @@
+import json
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional, Tuple
+
+
+@dataclass(frozen=True)
+class RenameOp:
+    source: str  # paths are relative to the plan's base_path
+    target: str
+    kind: str  # 'folder', 'movie', 'subtitle', 'episode', 'duplicate' or 'file'
+    reason: str = ''
+
+
+@dataclass(frozen=True)
+class Conflict:
+    source: str
+    target: Optional[str]
+    reason: str
+
+
+@dataclass(frozen=True)
+class RenamePlan:
+    base_path: str
+    operations: Tuple[RenameOp, ...] = ()
+    conflicts: Tuple[Conflict, ...] = ()
+    created: float = field(default_factory=time.time)
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), indent=2, ensure_ascii=False)
+
+    @classmethod
+    def from_json(cls, text: str) -> 'RenamePlan':
+        data = json.loads(text)
+        return cls(
+            base_path=data['base_path'],
+            operations=tuple(RenameOp(**op) for op in data['operations']),
+            conflicts=tuple(Conflict(**conflict) for conflict in data['conflicts']),
+            created=data['created'],
+        )
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as plan_file:
+            plan_file.write(self.to_json())
+
+    @classmethod
+    def load(cls, path) -> 'RenamePlan':
+        with open(path, encoding='utf-8') as plan_file:
+            return cls.from_json(plan_file.read())
+
+
+class PlanBuilder:
+    # Collects operations while keeping every target unique and free on disk
+    def __init__(self, base_path):
+        self.base_path = os.path.abspath(base_path)
+        self.operations = []
+        self.conflicts = []
+        self._targets = {}  # keyed case-insensitively: Windows, macOS and SMB shares fold case
+        self._sources = set()
+        self._expected = set()  # sources announced by add_sources, which may not get an op yet
+
+    def _abs(self, rel_path):
+        return os.path.join(self.base_path, rel_path)
+
+    def add_sources(self, sources):
+        # Announces every path about to be added, so a target that is currently
+        # another file's name is accepted whatever order the ops arrive in;
+        # build() drops it again if that file ends up staying put
+        self._expected.update(sources)
+
+    def add(self, source, target, kind, reason='') -> bool:
+        if source == target:
+            return False
+        if target.casefold() in self._targets:
+            claimant = self._targets[target.casefold()]
+            self.conflicts.append(Conflict(source, target, f"target already claimed by {claimant}"))
+            return False
+        if (target not in self._sources and target not in self._expected and os.path.lexists(self._abs(target))
+                and not same_file(self._abs(source), self._abs(target))):
+            self.conflicts.append(Conflict(source, target, "target already exists"))
+            return False
+
+        self._targets[target.casefold()] = source
+        self._sources.add(source)
+        self.operations.append(RenameOp(source, target, kind, reason))
+        return True
+
+    def claimant(self, target):
+        # Source of the operation that already claimed target, if any
+        return self._targets.get(target.casefold())
+
+    def skip(self, source, reason, target=None):
+        self.conflicts.append(Conflict(source, target, reason))
+
+    def build(self) -> RenamePlan:
+        # Targets accepted because their current owner was expected to move are
+        # re-checked now that every op is known; dropping one op can block another
+        operations, conflicts = list(self.operations), list(self.conflicts)
+        while True:
+            sources = {op.source for op in operations}
+            blocked = [op for op in operations
+                       if op.target not in sources and op.target in self._sources | self._expected
+                       and os.path.lexists(self._abs(op.target))
+                       and not same_file(self._abs(op.source), self._abs(op.target))]
+            if not blocked:
+                break
+            for op in blocked:
+                operations.remove(op)
+                conflicts.append(Conflict(op.source, op.target, "target already exists"))
+        return RenamePlan(self.base_path, tuple(operations), tuple(conflicts))
+
+
+def same_file(source, target):
+    # True for a case-only rename on a case-insensitive filesystem ("up" -> "Up")
+    try:
+        return os.path.samefile(source, target)
+    except OSError:
+        return False
+
+
+def _depth(rel_path):
+    return rel_path.count(os.sep)
+
+
+def _parents(rel_path):
+    parent = os.path.dirname(rel_path)
+    while parent:
+        yield parent
+        parent = os.path.dirname(parent)
+
+
+def ordered_operations(operations):
+    # Children before parents, so every source path is still valid when its
+    # turn comes: an op waits while another op's source lies under its own
+    # source, and an op whose target is another op's source waits for it
+    pending = sorted(operations, key=lambda op: -_depth(op.source))
+    ordered = []
+    while pending:
+        sources = {op.source for op in pending}
+        parents = {parent for op in pending for parent in _parents(op.source)}
+        ready = [op for op in pending if op.target not in sources and op.source not in parents]
+        if not ready:
+            # Cycle (a -> b, b -> a): park one source under a temporary name
+            op = pending[0]
+            parked = f"{op.source}.renaming"
+            ordered.append(RenameOp(op.source, parked, op.kind, 'break rename cycle'))
+            pending[0] = RenameOp(parked, op.target, op.kind, op.reason)
+            continue
+        ordered.extend(ready)
+        done = {id(op) for op in ready}
+        pending = [op for op in pending if id(op) not in done]
+    return ordered
+
+
+def transaction_groups(operations):
+    # Operations touching the same top-level entry, or chained through each
+    # other (one's target is another's source), succeed or roll back together.
+    # Groups keep the dependency order of ordered_operations
+    ordered = ordered_operations(operations)
+    parents = list(range(len(ordered)))
+
+    def find(index):
+        while parents[index] != index:
+            parents[index] = parents[parents[index]]
+            index = parents[index]
+        return index
+
+    first_by_root = {}
+    index_by_source = {op.source: index for index, op in enumerate(ordered)}
+    for index, op in enumerate(ordered):
+        for other in (first_by_root.setdefault(op.source.split(os.sep)[0], index),
+                      index_by_source.get(op.target, index)):
+            parents[find(index)] = find(other)
+
+    groups = {}
+    for index, op in enumerate(ordered):
+        groups.setdefault(find(index), []).append(op)
+    return list(groups.values())
+
+
+def validate_plan(plan: RenamePlan):
+    # Checks every rename before anything moves; returns [(op, problem)]
+    sources = {op.source for op in plan.operations}
+    claimed = set()
+    problems = []
+    for op in plan.operations:
+        source = os.path.join(plan.base_path, op.source)
+        target = os.path.join(plan.base_path, op.target)
+        if not os.path.lexists(source):
+            problems.append((op, "source is missing"))
+        elif op.target.casefold() in claimed:
+            problems.append((op, "another rename has the same target"))
+        elif os.path.lexists(target) and op.target not in sources and not same_file(source, target):
+            problems.append((op, "target already exists"))
+        elif op.kind != 'duplicate' and not os.path.isdir(os.path.dirname(target)):
+            problems.append((op, "target folder is missing"))
+        claimed.add(op.target.casefold())
+    return problems
+
+
+def rename_path(source, target):
+    if source != target and source.casefold() == target.casefold():
+        # Case-only renames go through a temporary name, which case-insensitive filesystems need
+        parked = f"{source}.case-renaming"
+        os.rename(source, parked)
+        source = parked
+    os.rename(source, target)
+
+
+def prune_empty_parents(new, old):
+    # Removes directories a move created (e.g. under .duplicates/) once they are
+    # empty again, stopping at the first directory shared with the old path
+    parent = os.path.dirname(new)
+    stop = os.path.commonpath([parent, os.path.dirname(old)])
+    while parent != stop and parent.startswith(stop):
+        try:
+            os.rmdir(parent)
+        except OSError:
+            return
+        parent = os.path.dirname(parent)
+
+
+def _roll_back(plan, done, journal=None):
+    for op in reversed(done):
+        source = os.path.join(plan.base_path, op.source)
+        target = os.path.join(plan.base_path, op.target)
+        try:
+            rename_path(target, source)
+        except OSError as e:
+            print(f"Could not roll back {op.target} -> {op.source}: {e}")
+            continue
+        if op.kind == 'duplicate':
+            prune_empty_parents(target, source)
+        if journal:
+            journal.record(target, source, op.kind)
+
+
+def apply_plan(plan: RenamePlan, journal=None, stats=None):
+    # Validates the whole plan up front, then applies it one transaction group
+    # at a time; a failed rename rolls its group back, so no folder is left
+    # half-renamed. Returns the operations carried out
+    invalid = validate_plan(plan)
+    bad_sources = set()
+    for op, problem in invalid:
+        print(f"Skipping {op.source} -> {op.target}: {problem}")
+        bad_sources.add(op.source)
+        if stats:
+            stats.count('invalid')
+
+    applied = []
+    for group in transaction_groups(plan.operations):
+        if any(op.source in bad_sources for op in group):
+            if len(group) > 1:
+                print(f"Skipping {len(group)} related rename(s) for {group[-1].source}: part of the group is invalid")
+            continue
+
+        done = []
+        try:
+            for op in group:
+                source = os.path.join(plan.base_path, op.source)
+                target = os.path.join(plan.base_path, op.target)
+                if op.kind == 'duplicate':
+                    # The only moves into a folder that may not exist yet: .duplicates/<path>
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                rename_path(source, target)
+                done.append(op)
+                if journal:
+                    journal.record(source, target, op.kind)
+        except OSError as e:
+            print(f"Failed to rename {op.source} -> {op.target}: {e}; rolling back {len(done)} rename(s)")
+            _roll_back(plan, done, journal)
+            if stats:
+                stats.count('error')
+                stats.count('rolled_back', len(done))
+            continue
+
+        applied.extend(done)
+        if stats:
+            stats.count('renamed', len(done))
+    return applied
@@ -0,0 +1,211 @@
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from movie_renamer.cleaning import compile_keywords, strip_keywords
+from movie_renamer.scan import classify
+
+# Keyword lists as they grew with each generation of the scripts
+BASIC_KEYWORDS = [
+    '1080p', '720p', '2160p', '480p',
+    '10bit', '8bit', 'BluRay', 'WEBRip', 'HDRip',
+    'BRRip', 'WEB-DL', 'x264', 'x265', 'HEVC',
+    'H264', 'AAC', 'DD5.1', 'DVDRip', 'AVC',
+    'PSA', 'YIFY', 'RARBG', 'EXTENDED', 'PROPER',
+    'REMASTERED', 'CH', '-', '_'
+]
+
+EXTENDED_KEYWORDS = [
+    '1080p', '720p', '2160p', '480p', '10bit', '8bit',
+    'BluRay', 'WEBRip', 'HDRip', 'BRRip', 'WEB-DL',
+    'x264', 'x265', 'HEVC', 'H264', 'AAC', 'DD5.1',
+    'DVDRip', 'AVC', 'PSA', 'YIFY', 'RARBG', 'EXTENDED',
+    'PROPER', 'REMASTERED', 'CH', 'mp4', 'mkv', 'avi',
+    'Korean', 'AV1Saon', '-', '-[YTS AM]', 'NF', 'DDP5 1', 'Pahe in', '_'
+]
+
+WATCHLIST_KEYWORDS = [
+    '1080p', '720p', '2160p', '480p', '10bit', '8bit',
+    'BluRay', 'WEBRip', 'HDRip', 'BRRip', 'WEB-DL',
+    'x264', 'x265', 'HEVC', 'H264', 'AAC', 'DD5.1',
+    'DVDRip', 'AVC', 'PSA', 'YIFY', 'RARBG', 'EXTENDED',
+    'PROPER', 'REMASTERED', 'CH', 'mp4', 'mkv', 'avi',
+    'Korean', 'AV1Saon', '-', '-[YTS AM]', 'NF', 'DDP5 1', 'Pahe in',
+    'ZEE5', '8CH', 'AA', 'BONE'
+]
+
+# Common quality/format tags stripped before an OMDb search
+OMDB_TAGS = [
+    '1080p', '720p', 'WEB-DL', 'WEBRip', 'BluRay', 'BRRip', 'DVDRip', 'HDRip', 'x264', 'x265',
+    'HEVC', 'AAC5.1', '10bit', '8CH', 'NF', 'YIFY', 'BONE', 'HIN', 'KAN', 'MAL', 'EXTENDED', 'IMAX',
+    'AV1', 'PROPER', 'DDP5.1', 'Saon', 'Korean'
+]
+
+PARSE_CACHE_SIZE = 65536  # parsed names kept across passes
+
+
+def is_renamed(name: str) -> bool:
+    return bool(re.match(r'^.+ \(\d{4}\)$', name))
+
+
+# Year styles: each takes the raw name and the compiled keyword pattern
+
+def truncate_at_year(name: str, pattern) -> str:
+    # Everything after the first year is dropped: "Up 2009 1080p" -> "Up (2009)"
+    name = re.sub(r'[._]', ' ', name)
+
+    year_match = re.search(r'(19|20)\d{2}', name)
+    year = year_match.group(0) if year_match else ''
+
+    if year:
+        name = name[:name.find(year)].strip() + f' ({year})'
+
+    name = strip_keywords(name, pattern)
+
+    return re.sub(r'\s+', ' ', name).strip()
+
+
+def move_year_to_end(name: str, pattern) -> str:
+    # The last year is pulled out of the title and appended in parentheses
+    name = re.sub(r'[._]', ' ', name)
+
+    years = re.findall(r'\b(?:19|20)\d{2}\b', name)
+    year = years[-1] if years else ''
+
+    name = strip_keywords(name, pattern)
+
+    name = re.sub(r'\s+', ' ', name).strip()
+
+    if year:
+        name = re.sub(r'\b' + year + r'\b', '', name).strip()
+        name += f' ({year})'
+
+    return name.strip()
+
+
+def bracket_last_year(name: str, pattern) -> str:
+    # The last year stays where it is and gains parentheses; trailing junk is kept
+    name = re.sub(r'[._]', ' ', name)
+
+    years = re.findall(r'\b(?:19|20)\d{2}\b', name)
+    year = years[-1] if years else ''
+
+    name = strip_keywords(name, pattern)
+
+    name = re.sub(r'\s+', ' ', name).strip()
+
+    if year and f'({year})' not in name:
+        name = re.sub(rf'\b{year}\b(?!.*\b{year}\b)', f'({year})', name)
+
+    return name.strip()
+
+
+def keywords_only(name: str, pattern) -> str:
+    # No year handling: the result is a search query, not a final name
+    name = re.sub(r'[._]', ' ', name)
+    name = re.sub(r'\s+', ' ', name)
+    name = strip_keywords(name, pattern)
+    return name.strip()
+
+
+def search_query(name: str, pattern) -> str:
+    # Expects the stem: the 'search' profile splits the extension off before parsing
+    name = re.sub(r'^backup_+', '', name)  # remove all backup_ prefixes
+    name = re.sub(r'[\[\](){}]', '', name)  # remove brackets
+    name = re.sub(r'[._\-]', ' ', name)  # normalize separators
+    name = re.sub(r'\s+', ' ', name).strip()
+    name = strip_keywords(name, pattern)
+    name = re.sub(r'\s+', ' ', name).strip()
+    return name
+
+
+def strip_leftovers(base: str, pattern) -> str:
+    base = strip_keywords(base, pattern)
+
+    base = base.replace('-', ' ')
+    return re.sub(r'\s+', ' ', base).strip()
+
+
+class ParsedName(NamedTuple):
+    name: str  # rendered in the profile's style, e.g. "Up (2009)"
+    title: str  # name without its year
+    year: str
+    extension: str  # lower-cased media extension, or '' when a stem was parsed
+    final: str  # name after the leftover-junk pass for final_pass profiles, else name
+    raw: str = ''
+    pattern: re.Pattern = None
+
+    @property
+    def tags(self) -> tuple:
+        # Junk keywords that were stripped; found on demand, so parsing scans each name only once
+        return tuple(tag for tag in self.pattern.findall(re.sub(r'[._]', ' ', self.raw)) if tag.strip('-_ '))
+
+
+class Profile(NamedTuple):
+    name: str
+    pattern: re.Pattern
+    style: Callable
+    first_video: bool = False  # pick the first video in a folder instead of the last
+    subtitles: bool = True  # rename the folder's last .srt to match
+    skip_renamed: bool = True  # leave "Title (Year)" folders alone
+    loose_files: bool = False  # also rename videos lying directly in the base directory
+    final_pass: bool = False  # strip leftover junk from every media name afterwards
+    split_extension: bool = False  # parse the stem only, so "Movie.mkv" and "Movie.srt" share a cache entry
+
+    def parse(self, name: str) -> ParsedName:
+        # Callers pass either a file name or a bare stem; only a media file name has an extension
+        extension = os.path.splitext(name)[1].lower() if classify(name) else ''
+        raw = os.path.splitext(name)[0] if self.split_extension else name
+        return _parse(self, raw, False)._replace(extension=extension)
+
+    def clean(self, name: str) -> str:
+        return self.parse(name).name
+
+    def final_clean(self, name: str) -> str:
+        # Leftover-junk pass for names the first pass did not produce; names it did
+        # produce already carry the result in ParsedName.final
+        path = Path(name)
+        base = _parse(self, path.stem, True).final
+        return f"{base}{path.suffix}" if path.suffix else base
+
+
+# Keyed by the raw text, so every pass and every sibling file with the same
+# stem reuses one parse instead of re-running the keyword scan
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse(profile, raw, leftovers_only):
+    if leftovers_only:
+        name = final = strip_leftovers(raw, profile.pattern)
+    else:
+        name = profile.style(raw, profile.pattern)
+        final = strip_leftovers(name, profile.pattern) if profile.final_pass else name
+
+    years = re.findall(r'\b(?:19|20)\d{2}\b', name)
+    year = years[-1] if years else ''
+    title = name
+    if year:
+        title = re.sub(rf'\(?\b{year}\b\)?(?!.*\b{year}\b)', '', name)
+        title = re.sub(r'\s+', ' ', title).strip()
+    return ParsedName(name, title, year, '', final, raw, profile.pattern)
+
+
+def parse_cache_info():
+    # (hits, misses, hit rate) of the shared name cache
+    info = _parse.cache_info()
+    total = info.hits + info.misses
+    return info.hits, info.misses, info.hits / total if total else 0.0
+
+
+# One profile per historical script, so each keeps its exact output
+PROFILES = {
+    'basic': Profile('basic', compile_keywords(BASIC_KEYWORDS), truncate_at_year,
+                     first_video=True, subtitles=False, skip_renamed=False),
+    'subtitles': Profile('subtitles', compile_keywords(BASIC_KEYWORDS), truncate_at_year),
+    'subtitles-advanced': Profile('subtitles-advanced', compile_keywords(EXTENDED_KEYWORDS), move_year_to_end,
+                                  loose_files=True),
+    'subtitles-advanced2': Profile('subtitles-advanced2', compile_keywords(WATCHLIST_KEYWORDS),
+                                   bracket_last_year, loose_files=True, final_pass=True),
+    'advanced': Profile('advanced', compile_keywords(BASIC_KEYWORDS), keywords_only),
+    'search': Profile('search', compile_keywords(OMDB_TAGS), search_query, split_extension=True),
+}
@@ -0,0 +1,86 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+VIDEO_EXTENSIONS = ('.mkv', '.mp4', '.avi')
+SUBTITLE_EXTENSIONS = ('.srt',)
+
+VIDEO = 'video'
+SUBTITLE = 'subtitle'
+
+
+def classify(name: str) -> Optional[str]:
+    lower = name.lower()
+    if lower.endswith(VIDEO_EXTENSIONS):
+        return VIDEO
+    if lower.endswith(SUBTITLE_EXTENSIONS):
+        return SUBTITLE
+    return None
+
+
+class Entry(NamedTuple):
+    name: str
+    path: str
+    is_dir: bool
+    kind: Optional[str]  # VIDEO, SUBTITLE, or None for directories and other files
+    is_link: bool = False  # symlink; recursive walks never descend into linked directories
+
+
+class FolderScan(NamedTuple):
+    name: str
+    path: str
+    videos: list
+    subtitles: list
+    subdirs: tuple = ()
+
+
+def scan_dir(path):
+    # One readdir per directory; is_dir() and is_symlink() come from the cached
+    # d_type, so plain files and folders cost no extra stat call (symlinks need one)
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            is_dir = entry.is_dir()
+            entries.append(Entry(entry.name, entry.path, is_dir, None if is_dir else classify(entry.name),
+                                 entry.is_symlink()))
+    return entries
+
+
+def scan_folder(name, path) -> FolderScan:
+    videos = []
+    subtitles = []
+    subdirs = []
+    for entry in scan_dir(path):
+        if entry.kind == VIDEO:
+            videos.append(entry.name)
+        elif entry.kind == SUBTITLE:
+            subtitles.append(entry.name)
+        elif entry.is_dir and not entry.is_link:
+            subdirs.append(entry.name)
+    return FolderScan(name, path, videos, subtitles, tuple(subdirs))
+
+
+def scan_folders(folders, workers=1):
+    # folders is a list of (name, path); results come back in the same order.
+    # Threads overlap the network round-trips of SMB/NFS directory listings
+    if workers <= 1 or len(folders) <= 1:
+        return [scan_folder(name, path) for name, path in folders]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda folder: scan_folder(*folder), folders))
+
+
+def walk_media(base_path):
+    # Recursive scandir walk yielding every video/subtitle file as an Entry.
+    # Like os.walk, linked directories are not followed, so "loop -> .." cannot recurse
+    stack = [base_path]
+    while stack:
+        path = stack.pop()
+        subdirs = []
+        for entry in scan_dir(path):
+            if entry.is_dir:
+                if not entry.is_link:
+                    subdirs.append(entry.path)
+            elif entry.kind:
+                yield entry
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,118 @@
+import hashlib
+import json
+import os
+import xml.etree.ElementTree as ET
+from datetime import datetime
+
+from movie_renamer.stats import Stats
+
+NFO_NAME = 'movie.nfo'
+JSON_NAME = 'movie.json'
+XML_HEADER = b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# OMDb field -> NFO tag; comma-separated fields become one tag per value
+NFO_FIELDS = (('Title', 'title'), ('Plot', 'plot'), ('Rated', 'mpaa'))
+NFO_LISTS = (('Genre', 'genre'), ('Country', 'country'), ('Director', 'director'), ('Writer', 'credits'))
+
+
+def _value(data, field):
+    value = str(data.get(field, '')).strip()
+    return '' if value == 'N/A' else value
+
+
+def movie_nfo(data) -> bytes:
+    # Kodi/Jellyfin movie.nfo built from a full OMDb title payload
+    root = ET.Element('movie')
+    for field, tag in NFO_FIELDS:
+        if _value(data, field):
+            ET.SubElement(root, tag).text = _value(data, field)
+    year = _value(data, 'Year')[:4]
+    if year.isdigit():
+        ET.SubElement(root, 'year').text = year
+    runtime = _value(data, 'Runtime').split(' ')[0]
+    if runtime.isdigit():
+        ET.SubElement(root, 'runtime').text = runtime
+    try:
+        released = datetime.strptime(_value(data, 'Released'), '%d %b %Y')
+        ET.SubElement(root, 'premiered').text = released.strftime('%Y-%m-%d')
+    except ValueError:
+        pass
+    if _value(data, 'imdbRating'):
+        ET.SubElement(root, 'rating').text = _value(data, 'imdbRating')
+    if _value(data, 'imdbID'):
+        ET.SubElement(root, 'uniqueid', type='imdb', default='true').text = _value(data, 'imdbID')
+    for field, tag in NFO_LISTS:
+        for value in filter(None, (part.strip() for part in _value(data, field).split(','))):
+            ET.SubElement(root, tag).text = value
+    for name in filter(None, (part.strip() for part in _value(data, 'Actors').split(','))):
+        ET.SubElement(ET.SubElement(root, 'actor'), 'name').text = name
+
+    ET.indent(root)
+    return XML_HEADER + ET.tostring(root, encoding='unicode').encode('utf-8') + b'\n'
+
+
+def movie_json(data) -> bytes:
+    return (json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False) + '\n').encode('utf-8')
+
+
+SIDECARS = {'nfo': ((NFO_NAME, movie_nfo),), 'json': ((JSON_NAME, movie_json),),
+            'both': ((NFO_NAME, movie_nfo), (JSON_NAME, movie_json))}
+
+
+def _digest(content) -> str:
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _unchanged(path, content) -> bool:
+    # Size first, so only a same-sized file on disk is read back and hashed
+    try:
+        if os.path.getsize(path) != len(content):
+            return False
+        with open(path, 'rb') as existing:
+            return _digest(existing.read()) == _digest(content)
+    except OSError:
+        return False
+
+
+def _read(path):
+    try:
+        with open(path, 'rb') as existing:
+            return existing.read()
+    except FileNotFoundError:
+        return None
+
+
+def write_sidecars(folders, kind='both', stats=None, journal=None):
+    # folders is {folder path: OMDb payload}. Every sidecar is rendered first and
+    # then written in one pass; files whose content hash already matches are left
+    # alone, so their mtime does not make the media server scrape them again.
+    # Writes are journaled with the bytes they replace, so --undo can revert them
+    stats = stats or Stats()
+    with stats.stage('sidecars'):
+        pending = [(os.path.join(folder, name), render(data))
+                   for folder, data in folders.items() for name, render in SIDECARS[kind]]
+        written = unchanged = 0
+        for path, content in pending:
+            if _unchanged(path, content):
+                unchanged += 1
+                stats.count('sidecar_unchanged')
+                continue
+            partial = path + '.partial'
+            try:
+                previous = _read(path) if journal else None
+                with open(partial, 'wb') as sidecar:
+                    sidecar.write(content)
+                os.replace(partial, path)
+            except OSError as e:
+                print(f"Could not write {path}: {e}")
+                stats.count('sidecar_error')
+                try:
+                    os.remove(partial)
+                except OSError:
+                    pass
+                continue
+            if journal:
+                journal.record_write(path, previous)
+            written += 1
+            stats.count('sidecar_written')
+    return written, unchanged
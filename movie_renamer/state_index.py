@@ -0,0 +1,74 @@
+import json
+import os
+
+STATE_FILE = '.rename_state.json'
+TARGET_EXISTS = 'target exists: '
+
+
+class StateIndex:
+    def __init__(self, base_path, filename=STATE_FILE):
+        self.base_path = base_path
+        self.path = os.path.join(base_path, filename)
+        self.base_mtime_ns = None
+        self.folders = {}
+        self._seen = {}
+
+        try:
+            with open(self.path, encoding='utf-8') as state_file:
+                data = json.load(state_file)
+            self.base_mtime_ns = data.get('base_mtime_ns')
+            self.folders = data.get('folders', {})
+        except (OSError, ValueError):
+            # A missing or half-written index just means a full scan
+            pass
+
+    def base_unchanged(self) -> bool:
+        # No folder was added, removed or renamed directly under base_path
+        return self.base_mtime_ns == os.stat(self.base_path).st_mtime_ns
+
+    def known_folders(self):
+        return list(self.folders)
+
+    def lookup(self, name, st):
+        # Returns the stored entry if the folder has not changed since it was recorded
+        entry = self.folders.get(name)
+        if (entry and entry['inode'] == st.st_ino and entry['mtime_ns'] == st.st_mtime_ns
+                and entry['size'] == st.st_size):
+            return entry
+        return None
+
+    def settled_decision(self, name, st):
+        # A folder that lost its target to an existing folder stays skipped while
+        # neither has changed. Unresolved folders are always retried: the lookup
+        # may have failed for a transient reason, or the cache/index may know more now
+        entry = self.lookup(name, st)
+        decision = entry.get('decision', '') if entry else ''
+        if decision.startswith(TARGET_EXISTS):
+            if os.path.isdir(os.path.join(self.base_path, decision[len(TARGET_EXISTS):])):
+                return decision
+        return None
+
+    def record(self, name, st, movie_file, subs, decision):
+        self._seen[name] = {
+            'inode': st.st_ino,
+            'mtime_ns': st.st_mtime_ns,
+            'size': st.st_size,
+            'movie_file': movie_file,
+            'subs': subs,
+            'decision': decision,
+        }
+
+    def forget(self, name):
+        self._seen.pop(name, None)
+
+    def save(self):
+        # Rewrite in place rather than via a temp file + rename: replacing the
+        # file would bump base_path's mtime and defeat the next run's shortcut
+        if not os.path.exists(self.path):
+            open(self.path, 'w', encoding='utf-8').close()
+        self.base_mtime_ns = os.stat(self.base_path).st_mtime_ns
+
+        with open(self.path, 'r+', encoding='utf-8') as state_file:
+            json.dump({'base_mtime_ns': self.base_mtime_ns, 'folders': self._seen}, state_file)
+            state_file.truncate()
+        self.folders = self._seen
@@ -0,0 +1,70 @@
+import cProfile
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+
+class Stats:
+    # Wall time and call count per stage, plus free-form counters
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.calls = Counter()
+        self.counts = Counter()
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.timings[name] += elapsed
+                self.calls[name] += 1
+
+    def count(self, name, amount=1):
+        with self._lock:
+            self.counts[name] += amount
+
+    def to_dict(self) -> dict:
+        return {
+            'total_seconds': round(time.perf_counter() - self._started, 6),
+            'stages': {name: {'seconds': round(seconds, 6), 'calls': self.calls[name]}
+                       for name, seconds in self.timings.items()},
+            'counts': dict(self.counts),
+        }
+
+    def report(self) -> str:
+        data = self.to_dict()
+        lines = [f"{'stage':<12}{'seconds':>12}{'share':>8}"]
+        total = data['total_seconds'] or 1.0
+        for name, stage in data['stages'].items():
+            lines.append(f"{name:<12}{stage['seconds']:>12.3f}{stage['seconds'] / total:>8.0%}")
+        lines.append(f"{'total':<12}{data['total_seconds']:>12.3f}")
+        if data['counts']:
+            lines.append('')
+            lines.extend(f"{name:<20}{value:>10}" for name, value in sorted(data['counts'].items()))
+        return '\n'.join(lines)
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as stats_file:
+            json.dump(self.to_dict(), stats_file, indent=2)
+
+
+@contextmanager
+def profiled(path):
+    # Optional cProfile hook; inspect the output with `python -m pstats PATH`
+    if not path:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
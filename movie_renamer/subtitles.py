@@ -0,0 +1,75 @@
+import os
+import re
+
+# Language markers seen on subtitle names (Movie.en.srt, Movie.English.SDH.srt), mapped to ISO 639-1
+LANGUAGES = {
+    'en': 'en', 'eng': 'en', 'english': 'en',
+    'fr': 'fr', 'fre': 'fr', 'french': 'fr',
+    'es': 'es', 'spa': 'es', 'spanish': 'es',
+    'de': 'de', 'ger': 'de', 'german': 'de',
+    'it': 'it', 'ita': 'it',
+    'hi': 'hi',
+}
+FLAGS = ('sdh', 'forced', 'cc')
+
+# Trailing language/accessibility markers on a cleaned (space-separated) subtitle name
+SUBTITLE_SUFFIX = re.compile(r'(?:\s+(?:' + '|'.join(list(LANGUAGES) + list(FLAGS)) + r'))+$', re.IGNORECASE)
+
+
+def subtitle_tag(name: str) -> str:
+    # "Movie.English.SDH.srt" -> "en.sdh"; '' when the name carries no marker
+    tokens = re.split(r'[._\s-]+', name.rsplit('.', 1)[0].lower())
+    language, flags = '', []
+    for token in reversed(tokens):
+        if token in FLAGS and not language:
+            flags.insert(0, token)
+        elif token in LANGUAGES and not language:
+            language = LANGUAGES[token]
+        else:
+            break
+    return '.'.join(filter(None, [language] + flags))
+
+
+def subtitle_targets(base: str, subs) -> list:
+    # A single subtitle becomes "<base>.srt". Several keep their language tag
+    # ("<base>.en.srt", "<base>.en.forced.srt") and any that still clash get a counter.
+    # Subtitles already named that way stay put, and new counters go around them
+    if len(subs) == 1:
+        return [base + '.srt']
+
+    named = re.compile(re.escape(base) + r'(?:\.[a-z]{2}(?:\.(?:' + '|'.join(FLAGS) + r'))*)?(?:\.\d+)?\.srt',
+                       re.IGNORECASE)
+    taken = {sub.casefold() for sub in subs if named.fullmatch(sub)}
+    targets = []
+    for sub in subs:
+        if named.fullmatch(sub):
+            targets.append(sub)
+            continue
+        tag = subtitle_tag(sub)
+        stem = f"{base}.{tag}" if tag else base
+        target = stem + '.srt'
+        counter = 2
+        while target.casefold() in taken:
+            target = f"{stem}.{counter}.srt"
+            counter += 1
+        taken.add(target.casefold())
+        targets.append(target)
+    return targets
+
+
+def spread_subtitles(renames):
+    # renames is a list of (source, target) paths; subtitles that would land on
+    # the same target get tagged names from subtitle_targets instead
+    by_target = {}
+    for source, target in renames:
+        if target.lower().endswith('.srt'):
+            by_target.setdefault(target.casefold(), []).append((source, target))
+
+    spread = dict(renames)
+    for group in by_target.values():
+        if len(group) > 1:
+            directory, name = os.path.split(group[0][1])
+            subs = [os.path.basename(source) for source, _ in group]
+            for (source, _), target in zip(group, subtitle_targets(name[:-len('.srt')], subs)):
+                spread[source] = os.path.join(directory, target)
+    return [(source, spread[source]) for source, _ in renames]
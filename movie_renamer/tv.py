@@ -0,0 +1,225 @@
+import os
+import re
+from typing import NamedTuple, Optional
+
+from movie_renamer.journal import Journal
+from movie_renamer.lookup import DEFAULT_RATE, DEFAULT_WORKERS, TokenBucket, resolve_all
+from movie_renamer.plan import PlanBuilder, apply_plan
+from movie_renamer.profiles import PROFILES
+from movie_renamer.scan import walk_media
+from movie_renamer.subtitles import spread_subtitles
+
+OMDB_API_KEY = "6b03617a"
+OMDB_URL = os.environ.get("OMDB_URL", "http://www.omdbapi.com/")
+
+PROFILE = PROFILES['advanced']
+
+EPISODE_PATTERNS = (
+    re.compile(r'\bS(\d{1,2})[ ._-]?E(\d{1,3})(?:[ ._-]?E(\d{1,3}))*\b', re.IGNORECASE),  # S01E02, S01E02E03
+    re.compile(r'\b(\d{1,2})x(\d{2,3})\b', re.IGNORECASE),  # 1x02
+)
+AIR_DATE = re.compile(r'\b((?:19|20)\d{2})[ ._-](0[1-9]|1[0-2])[ ._-](0[1-9]|[12]\d|3[01])\b')
+SHOW_YEAR = re.compile(r'\s*\(?\b((?:19|20)\d{2})\b\)?$')
+UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|]')
+RENAMED = re.compile(r'^.+ \((?:19|20)\d{2}\) - S\d{2,}E\d{2,}(?:-E\d{2,})?(?: - .+)?$')  # our own output
+
+
+class Episode(NamedTuple):
+    show: str
+    year: str  # disambiguating year from the release name ("Doctor.Who.2005.S01E01"), or ''
+    season: int  # 0 for date-based releases until the air date is matched
+    episode: int
+    aired: str  # YYYY-MM-DD for date-based releases, else ''
+    last_episode: int = 0  # E03 of a multi-episode S01E02E03 file, else 0
+
+
+def parse_episode(name: str) -> Optional[Episode]:
+    stem = os.path.splitext(name)[0]
+    for pattern in EPISODE_PATTERNS:
+        match = pattern.search(stem)
+        if match:
+            season, episode, aired = int(match.group(1)), int(match.group(2)), ''
+            last = int(match.group(3)) if match.lastindex == 3 and match.group(3) else 0
+            break
+    else:
+        match = AIR_DATE.search(stem)
+        if not match:
+            return None
+        season, episode, aired, last = 0, 0, '-'.join(match.groups()), 0
+
+    # "Show (2005) - S01E02" is our own output: drop the separator before the year
+    show = PROFILE.clean(stem[:match.start()]).rstrip(' -._')
+    year = ''
+    year_match = SHOW_YEAR.search(show)
+    if year_match:
+        year = year_match.group(1)
+        show = show[:year_match.start()].strip()
+    if not show:
+        return None
+    return Episode(show, year, season, episode, aired, last if last > episode else 0)
+
+
+def fetch_series(key, client, cache=None):
+    show, year = key
+    query = f"{show} {year}".strip()
+    params = {'t': show, 'type': 'series'}
+    if year:
+        params['y'] = year
+    try:
+        cached, data = cache.get('series', query) if cache else (False, None)
+        if not cached:
+            data = client.get(**params)
+            if cache:
+                cache.put('series', query, data)
+        if data.get("Response") == "True":
+            return data
+    except Exception as e:
+        print(f"OMDb series lookup failed for '{query}': {e}")
+    return None
+
+
+def fetch_season(key, client, cache=None):
+    # Returns {episode number: OMDb episode record} for one season
+    imdb_id, season = key
+    query = f"{imdb_id} {season}"
+    try:
+        cached, data = cache.get('season', query) if cache else (False, None)
+        if not cached:
+            data = client.get(i=imdb_id, Season=season)
+            if cache:
+                cache.put('season', query, data)
+        if data.get("Response") == "True":
+            return {int(ep['Episode']): ep for ep in data.get('Episodes', []) if ep.get('Episode', '').isdigit()}
+    except Exception as e:
+        print(f"OMDb season lookup failed for '{query}': {e}")
+    return {}
+
+
+def season_count(series) -> int:
+    total = series.get('totalSeasons', '')
+    return int(total) if total.isdigit() else 1
+
+
+def episode_code(season, episode, last=0):
+    # S01E02, or S01E02-E03 for a file holding several episodes
+    code = f"S{season:02d}E{episode:02d}"
+    return f"{code}-E{last:02d}" if last else code
+
+
+def episode_name(info, series=None, seasons=None):
+    # "Show (Year) - S01E02 - Episode Title", or None when OMDb has no such episode
+    if not series:
+        show = f"{info.show} ({info.year})" if info.year else info.show
+        if info.aired:
+            return f"{show} - {info.aired}"
+        return f"{show} - {episode_code(info.season, info.episode, info.last_episode)}"
+
+    show = UNSAFE_CHARS.sub('', series['Title'])
+    year = series.get('Year', '')[:4]
+    if year.isdigit():
+        show = f"{show} ({year})"
+
+    season, number, record = info.season, info.episode, None
+    if info.aired:
+        for season in range(1, season_count(series) + 1):
+            episodes = seasons.get((series['imdbID'], season), {})
+            number, record = next(((n, ep) for n, ep in episodes.items() if ep.get('Released') == info.aired),
+                                  (0, None))
+            if record:
+                break
+        if not record:
+            return None
+    else:
+        record = seasons.get((series['imdbID'], season), {}).get(number)
+
+    name = f"{show} - {episode_code(season, number, info.last_episode)}"
+    titles = [record.get('Title')] if record else []
+    if info.last_episode:
+        last = seasons.get((series['imdbID'], season), {}).get(info.last_episode)
+        titles.append(last.get('Title') if last else None)
+    titles = [UNSAFE_CHARS.sub('', title) for title in dict.fromkeys(titles) if title]
+    if titles:
+        name += f" - {' & '.join(titles)}"
+    return name
+
+
+def plan_episodes(directory, api_key=OMDB_API_KEY, cache=None, workers=DEFAULT_WORKERS, rate=DEFAULT_RATE,
+                  offline=False):
+    builder = PlanBuilder(directory)
+    top = os.path.normpath(directory)
+    episodes = []
+    for entry in walk_media(directory):
+        rel_path = os.path.relpath(entry.path, top)
+        if RENAMED.match(os.path.splitext(entry.name)[0]):
+            builder.skip(rel_path, "already renamed")
+            continue
+        info = parse_episode(entry.name)
+        if not info:
+            builder.skip(rel_path, "no episode number")
+            continue
+        episodes.append((rel_path, os.path.splitext(entry.name)[1].lower(), info))
+
+    # One lookup per show and one per season, however many episodes share them
+    series, seasons = {}, {}
+    if not offline and episodes:
+        from movie_renamer.omdb_client import OmdbClient
+
+        limiter = TokenBucket(rate) if rate else None
+        client = OmdbClient(api_key, OMDB_URL, pool_size=workers, limiter=limiter)
+        shows = [(info.show, info.year) for _, _, info in episodes]
+        series = resolve_all(shows, lambda key: fetch_series(key, client, cache), workers)
+
+        wanted = []
+        for _, _, info in episodes:
+            data = series[(info.show, info.year)]
+            if not data:
+                continue
+            if info.aired:
+                wanted.extend((data['imdbID'], season) for season in range(1, season_count(data) + 1))
+            else:
+                wanted.append((data['imdbID'], info.season))
+        seasons = resolve_all(wanted, lambda key: fetch_season(key, client, cache), workers)
+        print(f"{len(episodes)} episode(s) across {len(series)} show(s) and {len(seasons)} season(s)")
+        print(client.summary())
+        client.close()
+
+    renames = []
+    for rel_path, ext, info in episodes:
+        data = series.get((info.show, info.year))
+        if not offline and not data:
+            print(f"Could not find show '{info.show}' for {os.path.basename(rel_path)}")
+            builder.skip(rel_path, "no OMDb match")
+            continue
+        name = episode_name(info, data, seasons)
+        if not name:
+            print(f"No episode aired {info.aired} for {os.path.basename(rel_path)}")
+            builder.skip(rel_path, "no OMDb episode")
+            continue
+        renames.append((rel_path, os.path.join(os.path.dirname(rel_path), f"{name}{ext}")))
+
+    renames = spread_subtitles(renames)
+    builder.add_sources(rel_path for rel_path, _ in renames)
+    for rel_path, target in renames:
+        if not builder.add(rel_path, target, 'episode') and target != rel_path:
+            print(f"Skipping {os.path.basename(rel_path)}: '{os.path.basename(target)}' is already taken")
+
+    return builder.build()
+
+
+def rename_episodes(directory, api_key=OMDB_API_KEY, dry_run=True, cache=None, workers=DEFAULT_WORKERS,
+                    rate=DEFAULT_RATE, offline=False, plan_path=None):
+    plan = plan_episodes(directory, api_key, cache=cache, workers=workers, rate=rate, offline=offline)
+    if plan_path:
+        plan.save(plan_path)
+
+    if dry_run:
+        for op in plan.operations:
+            print(f"Would rename: {os.path.basename(op.source)} -> {os.path.basename(op.target)}")
+        return plan
+    if plan.operations:
+        with Journal.for_run(plan.base_path) as journal:
+            for op in apply_plan(plan, journal=journal):
+                print(f"Renamed: {os.path.basename(op.source)} -> {os.path.basename(op.target)}")
+        if journal.count:
+            print(f"Journal saved to {journal.path}")
+    return plan
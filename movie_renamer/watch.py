@@ -0,0 +1,152 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+WATCH_MASK = IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+DEFAULT_SETTLE = 10.0  # seconds without growth before a download counts as finished
+DEFAULT_POLL_INTERVAL = 5.0
+
+
+class _Inotify:
+    # Minimal ctypes binding: one watch on the download directory itself
+    def __init__(self, path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        if libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, f"inotify_add_watch failed for {path}")
+
+    def read(self, timeout):
+        # Returns (names, overflowed); blocks without using CPU until an event or the timeout
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return [], False
+        data = os.read(self.fd, 64 * 1024)
+        names = []
+        overflowed = False
+        offset = 0
+        while offset < len(data):
+            _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                overflowed = True
+            elif name:
+                names.append(os.fsdecode(name))
+        return names, overflowed
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _snapshot(path):
+    # (file count, total size, newest mtime) of a file or folder; changes while it is still growing
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    if not os.path.isdir(path):
+        return 1, st.st_size, st.st_mtime_ns
+
+    count, size, newest = 0, 0, st.st_mtime_ns
+    stack = [path]
+    while stack:
+        # Downloaders move and delete temporary files and folders while we look
+        try:
+            with os.scandir(stack.pop()) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    try:
+                        entry_stat = entry.stat(follow_symlinks=False)
+                    except FileNotFoundError:
+                        continue
+                    count += 1
+                    size += entry_stat.st_size
+                    newest = max(newest, entry_stat.st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return count, size, newest
+
+
+class Watcher:
+    # Calls on_ready(name) for every new top-level entry of path once it has
+    # stopped changing for `settle` seconds
+    def __init__(self, path, on_ready, settle=DEFAULT_SETTLE, poll_interval=DEFAULT_POLL_INTERVAL,
+                 use_inotify=True):
+        self.path = path
+        self.on_ready = on_ready
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self._pending = {}
+        self._known = set(os.listdir(path))
+        self._inotify = None
+
+        if use_inotify and sys.platform.startswith('linux'):
+            try:
+                self._inotify = _Inotify(path)
+            except OSError as e:
+                print(f"inotify unavailable ({e}); falling back to polling every {poll_interval}s")
+
+    def _rescan(self):
+        current = set(os.listdir(self.path))
+        new = current - self._known
+        self._known = current
+        return new
+
+    def _wait_for_names(self):
+        if self._inotify:
+            # Sleep indefinitely while idle; wake every second to re-check pending downloads
+            names, overflowed = self._inotify.read(1.0 if self._pending else None)
+            if overflowed:
+                return self._rescan()
+            self._known.update(names)
+            return set(names)
+
+        time.sleep(min(1.0, self.poll_interval) if self._pending else self.poll_interval)
+        return self._rescan()
+
+    def _check_pending(self):
+        now = time.monotonic()
+        for name, (snapshot, since) in list(self._pending.items()):
+            current = _snapshot(os.path.join(self.path, name))
+            if current is None:
+                del self._pending[name]
+            elif current != snapshot:
+                self._pending[name] = (current, now)
+            elif now - since >= self.settle:
+                del self._pending[name]
+                try:
+                    self.on_ready(name)
+                except Exception as e:
+                    # One bad download (or a flaky lookup) must not stop the daemon
+                    print(f"Failed to process {name}: {e!r}")
+
+    def run(self, stop=None):
+        # Loops until stop() returns True (forever by default)
+        try:
+            while not (stop and stop()):
+                for name in self._wait_for_names():
+                    if name.startswith('.'):
+                        continue
+                    self._pending[name] = (_snapshot(os.path.join(self.path, name)), time.monotonic())
+                self._check_pending()
+        finally:
+            if self._inotify:
+                self._inotify.close()
@@ -0,0 +1,23 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def tree():
+    # Sorted relative paths of everything under root, journals left out
+    def listing(root):
+        return sorted(os.path.relpath(os.path.join(path, name), root)
+                      for path, dirs, files in os.walk(root) for name in dirs + files
+                      if '.rename_journal' not in os.path.join(path, name))
+    return listing
+
+
+@pytest.fixture
+def touch():
+    # Creates empty files (and their folders) at paths relative to root
+    def create(root, *paths):
+        for path in paths:
+            os.makedirs(os.path.dirname(os.path.join(root, path)), exist_ok=True)
+            open(os.path.join(root, path), 'w').close()
+    return create
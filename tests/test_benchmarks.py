@@ -0,0 +1,20 @@
+import json
+
+from benchmarks import run_benchmarks
+
+STAGES = {'scan', 'walk', 'clean', 'plan', 'plan_online', 'rename'}
+
+
+def test_benchmark_smoke_run_writes_json_report(tmp_path):
+    output = tmp_path / 'bench.json'
+    run_benchmarks.main(['--folders', '5', '--root', str(tmp_path / 'missing' / 'root'), '--output', str(output)])
+
+    report = json.loads(output.read_text())
+    assert {'revision', 'timestamp', 'python', 'platform', 'parameters', 'files', 'results'} <= set(report)
+    assert report['parameters']['folders'] == 5 and report['files'] > 0
+    assert {row['stage'] for row in report['results']} == STAGES
+    assert {row['variant'] for row in report['results'] if row['stage'] == 'rename'} == set(run_benchmarks.CLEANERS)
+    for row in report['results']:
+        assert set(row) == {'variant', 'stage', 'seconds', 'items', 'items_per_second'}
+        assert row['seconds'] >= 0 and row['items'] >= 0
+    assert list((tmp_path / 'missing' / 'root').iterdir()) == []
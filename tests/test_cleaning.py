@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+from movie_renamer.cleaning import compile_keywords, strip_keywords
+from movie_renamer.profiles import PROFILES
+
+PATTERN = compile_keywords(['AA', 'AAC', '-', '-[YTS AM]', 'DD5.1', 'DDP5 1'])
+
+
+def sequential(name, keywords):
+    # The per-keyword loop the scripts used before
+    for word in keywords:
+        name = re.sub(r'\b' + re.escape(word) + r'\b', '', name, flags=re.IGNORECASE)
+    return name
+
+
+@pytest.mark.parametrize('name, expected', [
+    ('Up AAC x', 'Up  x'),
+    ('Up aa x', 'Up  x'),
+    ('Up DD5.1 x', 'Up  x'),
+    ('Up DDP5 1 x', 'Up  x'),
+    ('Up-[YTS AM]x', 'Upx'),
+    ('x264-YIFY', 'x264YIFY'),
+])
+def test_keywords_sharing_a_prefix(name, expected):
+    assert strip_keywords(name, PATTERN) == expected
+
+
+@pytest.mark.parametrize('name', ['Up AACX', 'Up AAX', 'Up DD5 x', 'Up - x', 'DDP5 10'])
+def test_longer_keyword_falls_back_to_the_word_boundary(name):
+    # Neither the long nor the short keyword ends on a word boundary here
+    assert strip_keywords(name, PATTERN) == name
+
+
+def test_matches_the_sequential_loop_on_separated_keywords():
+    keywords = ['AA', 'AAC', 'DD5.1', 'x264', 'BluRay', '1080p']
+    for name in ('Up 2009 1080p BluRay x264 AAC', 'Heat aa DD5.1 1995', 'Aaron 2001'):
+        assert strip_keywords(name, compile_keywords(keywords)) == sequential(name, keywords)
+
+
+@pytest.mark.parametrize('profile, name, expected', [
+    # One pass over the original name also strips the '-' joining two keywords;
+    # the per-keyword loop gave 'Movie  - (2019)', 'The Matrix  - (1999)' and 'Heat (1995) -'
+    ('subtitles-advanced', 'Movie.2019.1080p.WEBRip.x264-YIFY', 'Movie (2019)'),
+    ('subtitles-advanced', 'The.Matrix.1999.DDP5.1.AAC-RARBG', 'The Matrix (1999)'),
+    ('subtitles-advanced2', 'Heat 1995 720p HEVC-Pahe in', 'Heat (1995)'),
+    ('subtitles', 'Up.2009.1080p.BluRay.x264-[YTS.AM]', 'Up (2009)'),
+])
+def test_profile_output(profile, name, expected):
+    assert PROFILES[profile].clean(name) == expected
@@ -0,0 +1,50 @@
+import os
+
+from movie_renamer.duplicates import CHUNK_SIZE, PARTIAL_SPAN, find_duplicates
+from movie_renamer.stats import Stats
+
+
+def write(path, size, fill=b'a', patch=None):
+    # A file of `size` bytes; patch=(offset, byte) changes one byte
+    content = bytearray(fill * size)
+    if patch:
+        content[patch[0]] = patch[1]
+    path.write_bytes(bytes(content))
+    return str(path)
+
+
+def test_same_size_with_different_samples_stops_at_the_sample_stage(tmp_path):
+    size = PARTIAL_SPAN + CHUNK_SIZE
+    a = write(tmp_path / 'a.mkv', size)
+    b = write(tmp_path / 'b.mkv', size, patch=(0, ord('b')))
+    c = write(tmp_path / 'c.mkv', size - 1)
+    stats = Stats()
+    assert find_duplicates([a, b, c], stats) == []
+    assert (stats.counts['hash_partial'], stats.counts['hash_full']) == (2, 0)
+
+
+def test_same_samples_with_a_different_byte_elsewhere_needs_the_full_hash(tmp_path):
+    size = 4 * CHUNK_SIZE
+    # The middle sample covers [1.5, 2.5) MiB, so a byte at 1 MiB is outside every sample
+    a = write(tmp_path / 'a.mkv', size)
+    b = write(tmp_path / 'b.mkv', size, patch=(CHUNK_SIZE, ord('b')))
+    c = write(tmp_path / 'c.mkv', size)
+    stats = Stats()
+    assert find_duplicates([a, b, c], stats) == [sorted([a, c])]
+    assert (stats.counts['hash_partial'], stats.counts['hash_full']) == (3, 3)
+
+
+def test_files_up_to_three_mib_are_settled_by_the_sample_stage(tmp_path):
+    a = write(tmp_path / 'a.mkv', PARTIAL_SPAN)
+    b = write(tmp_path / 'b.mkv', PARTIAL_SPAN)
+    c = write(tmp_path / 'c.mkv', PARTIAL_SPAN, patch=(CHUNK_SIZE + 1, ord('c')))
+    empty, other_empty = write(tmp_path / 'd.mkv', 0), write(tmp_path / 'e.mkv', 0)
+    stats = Stats()
+    assert sorted(find_duplicates([a, b, c, empty, other_empty, a], stats)) == [sorted([a, b]),
+                                                                              sorted([empty, other_empty])]
+    assert stats.counts['hash_full'] == 0
+
+
+def test_missing_files_are_ignored(tmp_path):
+    a = write(tmp_path / 'a.mkv', 10)
+    assert find_duplicates([a, os.path.join(tmp_path, 'gone.mkv')]) == []
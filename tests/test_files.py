@@ -0,0 +1,38 @@
+import os
+
+from benchmarks.stub_omdb import start_stub_server
+from movie_renamer import files
+from movie_renamer.files import plan_directory, subtitle_queries
+from movie_renamer.scan import walk_media
+
+
+def test_subtitle_next_to_a_single_video_uses_its_query(tmp_path):
+    os.makedirs(tmp_path / 'Up.2009')
+    (tmp_path / 'Up.2009' / 'Up.2009.1080p.mkv').touch()
+    (tmp_path / 'Up.2009' / 'English.srt').touch()
+    os.makedirs(tmp_path / 'Subs')
+    (tmp_path / 'Subs' / 'English.srt').touch()
+    (tmp_path / 'Subs' / 'Heat.1995.en.srt').touch()
+
+    entries = sorted(walk_media(str(tmp_path)), key=lambda entry: entry.path)
+    queries = {os.path.relpath(entry.path, tmp_path): query for entry, query in zip(entries,
+                                                                                   subtitle_queries(entries))}
+    assert queries == {'Subs/English.srt': None, 'Subs/Heat.1995.en.srt': 'Heat 1995',
+                       'Up.2009/English.srt': 'Up 2009', 'Up.2009/Up.2009.1080p.mkv': 'Up 2009'}
+
+
+def test_language_only_subtitle_is_never_looked_up(tmp_path, monkeypatch):
+    server, url = start_stub_server()
+    monkeypatch.setattr(files, 'OMDB_URL', url)
+    os.makedirs(tmp_path / 'Up.2009')
+    (tmp_path / 'Up.2009' / 'Up.2009.1080p.mkv').touch()
+    (tmp_path / 'Up.2009' / 'English.srt').touch()
+    os.makedirs(tmp_path / 'Subs')
+    (tmp_path / 'Subs' / 'English.srt').touch()
+    try:
+        plan = plan_directory(str(tmp_path), 'key', rate=0)
+    finally:
+        server.shutdown()
+
+    assert sorted(op.target for op in plan.operations) == ['Up.2009/Up (2009).mkv', 'Up.2009/Up (2009).srt']
+    assert [(c.source, c.reason) for c in plan.conflicts] == [('Subs/English.srt', 'no title in name')]
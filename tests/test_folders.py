@@ -0,0 +1,35 @@
+from movie_renamer.cli import main
+from movie_renamer.folders import plan_folders_and_files
+from movie_renamer.journal import latest_journal, undo_journal
+from movie_renamer.profiles import PROFILES
+
+
+def test_releases_of_one_movie_do_not_collide(tmp_path, capsys):
+    for release in ('Up.2009.1080p', 'Up.2009.720p'):
+        (tmp_path / release).mkdir()
+        (tmp_path / release / f'{release}.mkv').write_text(release)
+    (tmp_path / 'Heat.1995.mkv').write_text('first')
+    (tmp_path / 'Heat.1995.x264.mkv').write_text('second')
+
+    assert main(['clean', str(tmp_path), '--profile', 'subtitles-advanced']) == 0
+    assert 'target already claimed' in capsys.readouterr().out
+    names = sorted(path.name for path in tmp_path.iterdir())
+    # Whichever release is listed first gets the name; the other stays put
+    assert names[:2] == ['.rename_journal', 'Heat (1995).mkv'] and 'Up (2009)' in names and len(names) == 5
+    assert {(tmp_path / name).read_text() for name in names if name.endswith('.mkv')} == {'first', 'second'}
+
+    assert undo_journal(latest_journal(str(tmp_path))) == (3, 0)
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        '.rename_journal', 'Heat.1995.mkv', 'Heat.1995.x264.mkv', 'Up.2009.1080p', 'Up.2009.720p']
+
+
+def test_plan_renames_files_inside_the_old_folder(tmp_path):
+    (tmp_path / 'Up.2009.1080p').mkdir()
+    (tmp_path / 'Up.2009.1080p' / 'Up.2009.1080p.mkv').touch()
+    (tmp_path / 'Up.2009.1080p' / 'Up.2009.BONE.srt').touch()
+    plan = plan_folders_and_files(str(tmp_path), PROFILES['subtitles'])
+    assert sorted((op.source, op.target) for op in plan.operations) == [
+        ('Up.2009.1080p', 'Up (2009)'),
+        ('Up.2009.1080p/Up.2009.1080p.mkv', 'Up.2009.1080p/Up (2009).mkv'),
+        ('Up.2009.1080p/Up.2009.BONE.srt', 'Up.2009.1080p/Up (2009).srt'),
+    ]
@@ -0,0 +1,55 @@
+import gzip
+
+import pytest
+
+from movie_renamer.local_index import LocalIndex, build_index, title_key
+
+ROWS = [
+    ('tt1', 'movie', 'Heat', 'Heat', '0', '1995'),
+    ('tt2', 'movie', 'Heat', 'Heat', '0', '1986'),
+    ('tt3', 'tvSeries', 'HEAT', 'HEAT', '0', '1995'),  # same key and year as tt1
+    ('tt4', 'movie', 'Amélie', 'Le Fabuleux Destin d\'Amélie Poulain', '0', '2001'),
+    ('tt5', 'short', 'Up', 'Up', '0', '2009'),
+    ('tt6', 'movie', 'Up', 'Up', '0', '2009'),
+    ('tt7', 'movie', 'Blue', 'Blue', '1', '2000'),
+    ('tt8', 'movie', 'Nameless', 'Nameless', '0', '\\N'),
+]
+
+
+@pytest.fixture
+def index(tmp_path):
+    dump = tmp_path / 'title.basics.tsv.gz'
+    header = ('tconst', 'titleType', 'primaryTitle', 'originalTitle', 'isAdult', 'startYear')
+    with gzip.open(dump, 'wt', encoding='utf-8') as tsv:
+        for row in (header,) + tuple(ROWS):
+            tsv.write('\t'.join(row) + '\n')
+    assert build_index(str(dump), str(tmp_path / 'titles.sqlite')) == 6  # no short, no adult title
+    index = LocalIndex(str(tmp_path / 'titles.sqlite'))
+    yield index
+    index.close()
+
+
+def test_title_key_folds_accents_and_punctuation():
+    assert title_key("Le Fabuleux Destin d'Amélie Poulain") == 'le fabuleux destin d amelie poulain'
+
+
+def test_exact_year_then_nearest_then_films_first(index):
+    assert index.lookup('Heat 1995') == 'Heat (1995)'
+    assert index.lookup('Heat 1987') == 'Heat (1986)'
+    assert index.lookup('Heat') == 'Heat (1995)'
+    assert index.lookup('Up 2009') == 'Up (2009)'
+
+
+def test_original_title_is_indexed_too(index):
+    assert index.lookup('Le Fabuleux Destin d Amelie Poulain 2001') == 'Amélie (2001)'
+
+
+def test_trailing_words_are_dropped_only_for_the_exact_year(index):
+    assert index.lookup('Heat Directors Cut 1995') == 'Heat (1995)'
+    assert index.lookup('Heat Directors Cut 1990') is None
+    assert index.lookup('Heat Directors Cut') is None
+
+
+def test_unknown_and_yearless_titles(index):
+    assert index.lookup('Blue 2000') is None
+    assert index.lookup('Nameless') is None
@@ -0,0 +1,35 @@
+from movie_renamer.matching import best_candidate, rank_candidates, split_year
+
+RINGS = [
+    {'Title': 'The Lord of the Rings', 'Year': '1978'},
+    {'Title': 'The Lord of the Rings: The Fellowship of the Ring', 'Year': '2001'},
+    {'Title': 'The Lord of the Rings: The Two Towers', 'Year': '2002'},
+    {'Title': 'The Lord of the Rings: The Rings of Power', 'Year': '2022–'},
+]
+
+
+def test_split_year_takes_the_last_year():
+    assert split_year('Blade Runner 2049 2017') == ('Blade Runner 2049', 2017)
+    assert split_year('Up') == ('Up', None)
+    assert split_year('1917') == ('1917', 1917)
+
+
+def test_year_in_the_query_picks_that_film():
+    assert best_candidate('The Lord of the Rings 2001', RINGS)['Year'] == '2001'
+    assert best_candidate('The Lord of the Rings', RINGS, year=2002)['Year'] == '2002'
+
+
+def test_without_a_year_the_closest_title_wins():
+    ranked = rank_candidates('The Lord of the Rings', RINGS)
+    assert ranked[0][1]['Year'] == '1978'
+    assert [score for score, _ in ranked] == sorted((score for score, _ in ranked), reverse=True)
+
+
+def test_year_off_by_one_beats_a_distant_year():
+    candidates = [{'Title': 'Heat', 'Year': '1986'}, {'Title': 'Heat', 'Year': '1995'}]
+    assert best_candidate('Heat 1996', candidates)['Year'] == '1995'
+
+
+def test_unrelated_titles_give_no_match():
+    assert best_candidate('zzz', [{'Title': 'Up', 'Year': '2009'}]) is None
+    assert best_candidate('Up', []) is None
@@ -0,0 +1,65 @@
+import time
+
+import pytest
+
+from benchmarks.stub_omdb import start_stub_server
+from movie_renamer import omdb_cache
+from movie_renamer.omdb_cache import HIT_TTL, MISS_TTL, OmdbCache
+from movie_renamer.omdb_client import OmdbClient
+from movie_renamer.pipeline import fetch_omdb_title
+
+
+@pytest.fixture(scope='module')
+def stub_url():
+    server, url = start_stub_server()
+    yield url
+    server.shutdown()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = OmdbCache(str(tmp_path / 'omdb.sqlite'))
+    yield cache
+    cache.close()
+
+
+def lookup(url, cache, raw):
+    client = OmdbClient('key', url, retries=0)
+    try:
+        return fetch_omdb_title(raw, client, cache), client.requests
+    finally:
+        client.close()
+
+
+def later(monkeypatch, seconds):
+    now = time.time()
+    monkeypatch.setattr(omdb_cache.time, 'time', lambda: now + seconds)
+
+
+def test_hit_is_served_from_cache_on_second_run(stub_url, cache):
+    assert lookup(stub_url, cache, 'The.Matrix.1999.1080p') == ('The Matrix (1999)', 1)
+    assert lookup(stub_url, cache, 'The.Matrix.1999.1080p') == ('The Matrix (1999)', 0)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_not_found_is_cached_as_miss(stub_url, cache):
+    assert lookup(stub_url, cache, '1999') == (None, 1)
+    assert lookup(stub_url, cache, '1999') == (None, 0)
+    found, payload, _ = cache._db.execute("SELECT found, payload, stored_at FROM responses").fetchone()
+    assert found == 0 and '"Response": "False"' in payload
+
+
+def test_entries_expire_after_their_ttl(stub_url, cache, monkeypatch):
+    lookup(stub_url, cache, 'The.Matrix.1999.1080p')
+    lookup(stub_url, cache, '1999')
+
+    later(monkeypatch, MISS_TTL - 60)
+    assert cache.get('t', 'The Matrix 1999')[0] and cache.get('t', '1999')[0]
+
+    later(monkeypatch, MISS_TTL + 60)
+    assert cache.get('t', 'The Matrix 1999')[0]
+    assert cache.get('t', '1999') == (False, None)
+
+    later(monkeypatch, HIT_TTL + 60)
+    assert cache.get('t', 'The Matrix 1999') == (False, None)
+    assert lookup(stub_url, cache, 'The.Matrix.1999.1080p') == ('The Matrix (1999)', 1)
@@ -0,0 +1,85 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from benchmarks.stub_omdb import StubHandler
+from movie_renamer import omdb_client
+from movie_renamer.omdb_client import MAX_RETRY_DELAY, OmdbClient
+
+
+def flaky_server(failures, retry_after=None):
+    # The stub answers 503 to the first `failures` requests
+    calls = []
+
+    class Handler(StubHandler):
+        def do_GET(self):
+            calls.append(self.path)
+            if len(calls) > failures:
+                return super().do_GET()
+            self.send_response(503)
+            if retry_after:
+                self.send_header('Retry-After', retry_after)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+    monkeypatch.setattr(omdb_client.time, 'sleep', delays.append)
+    return delays
+
+
+def client_for(url, **options):
+    return OmdbClient('key', url, **options)
+
+
+def test_retries_then_succeeds(sleeps):
+    server, url = flaky_server(2)
+    client = client_for(url, retries=3, backoff=0.5)
+    try:
+        assert client.get(t='Up 2009')['Title'] == 'Up'
+    finally:
+        client.close()
+        server.shutdown()
+    assert (client.requests, client.retried, client.failures) == (3, 2, 0)
+    assert sleeps == [0.5, 1.0]
+
+
+def test_gives_up_after_the_last_retry(sleeps):
+    server, url = flaky_server(5)
+    client = client_for(url, retries=2)
+    try:
+        with pytest.raises(requests.HTTPError):
+            client.get(t='Up 2009')
+    finally:
+        client.close()
+        server.shutdown()
+    assert (client.requests, client.retried, client.failures) == (3, 2, 1)
+
+
+def test_retry_after_is_honoured_and_capped(sleeps):
+    server, url = flaky_server(2, retry_after='3600')
+    client = client_for(url, retries=2)
+    try:
+        client.get(t='Up 2009')
+    finally:
+        client.close()
+        server.shutdown()
+    assert sleeps == [MAX_RETRY_DELAY, MAX_RETRY_DELAY]
+
+    server, url = flaky_server(1, retry_after='2')
+    client = client_for(url, retries=2)
+    try:
+        client.get(t='Up 2009')
+    finally:
+        client.close()
+        server.shutdown()
+    assert sleeps[2:] == [2.0]
@@ -0,0 +1,41 @@
+import random
+
+from benchmarks.synthetic import release_name
+from movie_renamer import parallel
+from movie_renamer.parallel import parse_all
+from movie_renamer.pipeline import clean_title
+
+
+def names(count):
+    rng = random.Random(7)
+    return [release_name(rng, index) for index in range(count)]
+
+
+def test_pooled_output_matches_serial():
+    sample = names(1000)
+    assert parse_all(clean_title, sample, jobs=2) == [clean_title(name) for name in sample]
+
+
+def test_chunks_spread_over_every_worker(monkeypatch):
+    used = {}
+
+    class Pool:
+        def __init__(self, max_workers):
+            used['workers'] = max_workers
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def map(self, func, items, chunksize):
+            used['chunksize'] = chunksize
+            return map(func, items)
+
+    monkeypatch.setattr(parallel, 'ProcessPoolExecutor', Pool)
+    parse_all(str.upper, names(4000), jobs=8)
+    assert used == {'workers': 8, 'chunksize': 125}
+    used.clear()
+    parse_all(str.upper, names(100), jobs=8)
+    assert used == {}
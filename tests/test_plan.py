@@ -0,0 +1,61 @@
+from movie_renamer.cli import main
+from movie_renamer.plan import PlanBuilder, RenameOp, apply_plan, ordered_operations
+
+
+def test_folder_waits_for_chained_renames_inside_it():
+    ops = [RenameOp('X', 'Y', 'folder'), RenameOp('X/b.srt', 'X/c.srt', 'subtitle'),
+           RenameOp('X/a.srt', 'X/b.srt', 'subtitle')]
+    assert [op.source for op in ordered_operations(ops)] == ['X/b.srt', 'X/a.srt', 'X']
+
+
+def test_chained_renames_inside_renamed_folder_apply(tmp_path, tree, touch):
+    touch(tmp_path, 'X/a.srt', 'X/b.srt')
+    builder = PlanBuilder(str(tmp_path))
+    builder.add('X', 'Y', 'folder')
+    builder.add('X/b.srt', 'X/c.srt', 'subtitle')
+    builder.add('X/a.srt', 'X/b.srt', 'subtitle')
+
+    assert len(apply_plan(builder.build())) == 3
+    assert tree(tmp_path) == ['Y', 'Y/b.srt', 'Y/c.srt']
+
+
+def test_apply_plan_dry_run_does_not_rename(tmp_path, capsys, tree, touch):
+    touch(tmp_path, 'X/a.mkv')
+    builder = PlanBuilder(str(tmp_path))
+    builder.add('X', 'Y', 'folder')
+    builder.build().save(str(tmp_path / 'plan.json'))
+
+    assert main(['folders', '--apply-plan', str(tmp_path / 'plan.json'), '--dry-run']) == 0
+    assert 'Would rename: X -> Y' in capsys.readouterr().out
+    assert tree(tmp_path) == ['X', 'X/a.mkv', 'plan.json']
+
+
+def test_stale_plan_does_not_create_folders(tmp_path, tree, touch):
+    touch(tmp_path, 'X/a.mkv', 'Y/b.mkv')
+    builder = PlanBuilder(str(tmp_path))
+    builder.add('X/a.mkv', 'Gone/a.mkv', 'movie')
+    builder.add('Y/b.mkv', '.duplicates/Y/b.mkv', 'duplicate')
+
+    applied = apply_plan(builder.build())
+    assert [op.source for op in applied] == ['Y/b.mkv']
+    assert tree(tmp_path) == ['.duplicates', '.duplicates/Y', '.duplicates/Y/b.mkv', 'X', 'X/a.mkv', 'Y']
+
+
+def test_builder_accepts_chained_targets_in_any_order(tmp_path, touch):
+    touch(tmp_path, 'X/a.srt', 'X/b.srt')
+    builder = PlanBuilder(str(tmp_path))
+    builder.add_sources(['X/a.srt', 'X/b.srt'])
+    builder.add('X/a.srt', 'X/b.srt', 'subtitle')
+    builder.add('X/b.srt', 'X/c.srt', 'subtitle')
+    plan = builder.build()
+    assert len(plan.operations) == 2 and plan.conflicts == ()
+
+
+def test_builder_drops_target_whose_owner_stays(tmp_path, touch):
+    touch(tmp_path, 'X/a.srt', 'X/b.srt')
+    builder = PlanBuilder(str(tmp_path))
+    builder.add_sources(['X/a.srt', 'X/b.srt'])
+    builder.add('X/a.srt', 'X/b.srt', 'subtitle')
+    plan = builder.build()
+    assert plan.operations == ()
+    assert [(c.source, c.reason) for c in plan.conflicts] == [('X/a.srt', 'target already exists')]
@@ -0,0 +1,28 @@
+from movie_renamer.profiles import PROFILES, parse_cache_info
+
+
+def test_extension_is_only_set_for_media_file_names():
+    advanced, search = PROFILES['advanced'], PROFILES['search']
+    assert advanced.parse('The.Matrix.1999.1080p.BluRay.x264-YIFY').extension == ''
+    assert advanced.parse('The.Matrix.1999.1080p.BluRay.x264-YIFY.mkv').extension == '.mkv'
+    assert search.parse('Heat.1995.720p.SRT').extension == '.srt'
+
+
+def test_structured_result():
+    parsed = PROFILES['subtitles'].parse('Up.2009.1080p.BluRay.x264-YIFY.mkv')
+    assert (parsed.name, parsed.title, parsed.year) == ('Up (2009)', 'Up', '2009')
+    assert parsed.tags == ('1080p', 'BluRay', 'x264', 'YIFY')
+
+
+def test_final_pass_reuses_the_first_parse():
+    profile = PROFILES['subtitles-advanced2']
+    parsed = profile.parse('Requiem.for.a.Dream.2000.DIRECTORS-CUT.1080p.BONE.mkv')
+    assert parsed.final == profile.final_clean(parsed.name + '.mkv')[:-len('.mkv')]
+
+
+def test_sibling_files_share_one_cache_entry():
+    search = PROFILES['search']
+    search.parse('Heat.1995.720p.WEBRip.mkv')
+    hits, misses, _ = parse_cache_info()
+    assert search.parse('Heat.1995.720p.WEBRip.srt').extension == '.srt'
+    assert parse_cache_info()[:2] == (hits + 1, misses)
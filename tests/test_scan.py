@@ -0,0 +1,24 @@
+import os
+
+from movie_renamer.scan import scan_folder, scan_folders, walk_media
+
+
+def test_walk_media_does_not_follow_directory_links(tmp_path):
+    os.makedirs(tmp_path / 'Show' / 'Season 1')
+    (tmp_path / 'Show' / 'Season 1' / 'Show.S01E01.mkv').touch()
+    os.symlink('..', tmp_path / 'Show' / 'Season 1' / 'loop')
+
+    assert [entry.name for entry in walk_media(str(tmp_path))] == ['Show.S01E01.mkv']
+    assert scan_folder('Season 1', str(tmp_path / 'Show' / 'Season 1')).subdirs == ()
+
+
+def test_scan_folders_returns_a_list_for_any_worker_count(tmp_path):
+    folders = []
+    for name in ('a', 'b'):
+        os.makedirs(tmp_path / name)
+        (tmp_path / name / f'{name}.mkv').touch()
+        folders.append((name, str(tmp_path / name)))
+
+    serial, threaded = scan_folders(folders, 1), scan_folders(folders, 4)
+    assert isinstance(serial, list) and serial == threaded
+    assert [listing.videos for listing in serial] == [['a.mkv'], ['b.mkv']]
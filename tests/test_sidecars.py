@@ -0,0 +1,74 @@
+import os
+
+import pytest
+
+from benchmarks.stub_omdb import start_stub_server
+from movie_renamer import pipeline, sidecars
+from movie_renamer.journal import latest_journal, undo_journal
+from movie_renamer.omdb_cache import OmdbCache
+from movie_renamer.sidecars import write_sidecars
+from movie_renamer.stats import Stats
+
+
+@pytest.fixture
+def online(tmp_path, monkeypatch):
+    server, url = start_stub_server()
+    monkeypatch.setattr(pipeline, 'OMDB_URL', url)
+    cache = OmdbCache(str(tmp_path / 'omdb.sqlite'))
+    yield cache
+    cache.close()
+    server.shutdown()
+
+
+@pytest.fixture
+def library(tmp_path):
+    root = tmp_path / 'lib'
+    for release in ('Up.2009.1080p', 'Heat.1995.720p'):
+        os.makedirs(root / release)
+        (root / release / f'{release}.mkv').touch()
+    return root
+
+
+def run(root, cache, **options):
+    stats = Stats()
+    pipeline.rename_stuff(str(root), verify_online=True, cache=cache, workers=1, rate=0, stats=stats,
+                          sidecars='both', **options)
+    return stats
+
+
+def test_refresh_revisits_renamed_folders_from_cache(library, online):
+    first = run(library, online)
+    assert first.counts['sidecar_written'] == 4
+    nfo = library / 'Up (2009)' / 'movie.nfo'
+    mtime = nfo.stat().st_mtime_ns
+
+    second = run(library, online, refresh_sidecars=True)
+    assert second.counts['requests'] == 0
+    assert (second.counts['sidecar_written'], second.counts['sidecar_unchanged']) == (0, 4)
+    assert nfo.stat().st_mtime_ns == mtime
+
+    nfo.write_text('stale')
+    third = run(library, online, refresh_sidecars=True)
+    assert (third.counts['sidecar_written'], third.counts['sidecar_unchanged']) == (1, 3)
+    assert b'<title>Up</title>' in nfo.read_bytes()
+
+
+def test_undo_removes_written_sidecars_and_restores_replaced_ones(library, online):
+    run(library, online)
+    assert undo_journal(latest_journal(str(library)))[1] == 0
+    assert sorted(os.listdir(library / 'Up.2009.1080p')) == ['Up.2009.1080p.mkv']
+
+    run(library, online)
+    (library / 'Up (2009)' / 'movie.nfo').write_text('mine')
+    run(library, online, refresh_sidecars=True)
+    assert undo_journal(latest_journal(str(library)))[1] == 0
+    assert (library / 'Up (2009)' / 'movie.nfo').read_text() == 'mine'
+
+
+def test_failed_write_leaves_no_partial_file(tmp_path, monkeypatch):
+    def refuse(source, target):
+        raise OSError("read-only")
+
+    monkeypatch.setattr(sidecars.os, 'replace', refuse)
+    assert write_sidecars({str(tmp_path): {'Title': 'Up', 'Year': '2009'}}) == (0, 0)
+    assert os.listdir(tmp_path) == []
@@ -0,0 +1,55 @@
+import os
+
+from movie_renamer import plan as plan_module
+from movie_renamer.pipeline import rename_stuff
+from movie_renamer.stats import Stats
+
+
+def make_library(root):
+    os.makedirs(root / 'Up 2009')
+    os.makedirs(root / 'Up.2009.1080p')
+    (root / 'Up.2009.1080p' / 'Up.2009.1080p.mkv').touch()
+
+
+def test_folder_blocked_by_existing_target_is_skipped_on_next_run(tmp_path):
+    make_library(tmp_path)
+    first, second = Stats(), Stats()
+    rename_stuff(str(tmp_path), stats=first)
+    plan = rename_stuff(str(tmp_path), stats=second)
+
+    assert first.counts['settled'] == 0
+    assert second.counts['settled'] == 1
+    assert second.counts['titles'] == 0
+    assert [(c.source, c.target) for c in plan.conflicts if c.source == 'Up.2009.1080p'] == [
+        ('Up.2009.1080p', 'Up 2009')]
+
+
+def test_blocked_folder_is_retried_once_its_target_is_gone(tmp_path):
+    make_library(tmp_path)
+    rename_stuff(str(tmp_path))
+    os.rmdir(tmp_path / 'Up 2009')
+
+    stats = Stats()
+    rename_stuff(str(tmp_path), stats=stats)
+    assert stats.counts['settled'] == 0
+    assert os.path.exists(tmp_path / 'Up 2009' / 'Up 2009.mkv')
+
+
+def test_failed_rename_is_retried_on_next_run(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / 'Up.2009.1080p')
+    (tmp_path / 'Up.2009.1080p' / 'Up.2009.1080p.mkv').touch()
+    rename = plan_module.rename_path
+
+    def fail_on_folder(source, target):
+        if target.endswith('Up 2009'):
+            raise OSError("busy")
+        rename(source, target)
+
+    monkeypatch.setattr(plan_module, 'rename_path', fail_on_folder)
+    rename_stuff(str(tmp_path))
+    monkeypatch.setattr(plan_module, 'rename_path', rename)
+
+    stats = Stats()
+    rename_stuff(str(tmp_path), stats=stats)
+    assert stats.counts['folders'] == 1
+    assert os.path.exists(tmp_path / 'Up 2009' / 'Up 2009.mkv')
@@ -0,0 +1,34 @@
+import os
+
+from movie_renamer.pipeline import plan_renames
+from movie_renamer.subtitles import spread_subtitles, subtitle_tag, subtitle_targets
+
+
+def test_language_tags():
+    assert subtitle_tag('Movie.English.SDH.srt') == 'en.sdh'
+    assert subtitle_tag('Movie.fre.srt') == 'fr'
+    assert subtitle_tag('Movie.srt') == ''
+    assert subtitle_targets('Up (2009)', ['Up.eng.srt', 'Up.French.srt']) == ['Up (2009).en.srt', 'Up (2009).fr.srt']
+    assert spread_subtitles([('a.mkv', 'Up.mkv'), ('a.en.srt', 'Up.srt'), ('a.fr.srt', 'Up.srt')]) == [
+        ('a.mkv', 'Up.mkv'), ('a.en.srt', 'Up.en.srt'), ('a.fr.srt', 'Up.fr.srt')]
+
+
+def test_subtitles_already_named_keep_their_name_in_any_order():
+    subs = ['Up 2009.srt', 'Up 2009.2.srt', 'a.srt']
+    expected = {'Up 2009.srt': 'Up 2009.srt', 'Up 2009.2.srt': 'Up 2009.2.srt', 'a.srt': 'Up 2009.3.srt'}
+    for order in (subs, subs[::-1]):
+        assert dict(zip(order, subtitle_targets('Up 2009', order))) == expected
+
+
+def test_plan_renames_only_moves_the_unnamed_subtitle(tmp_path):
+    os.makedirs(tmp_path / 'Up.2009.1080p')
+    for name in ('Up.2009.1080p.mkv', 'Up 2009.srt', 'Up 2009.2.srt', 'a.srt'):
+        (tmp_path / 'Up.2009.1080p' / name).touch()
+
+    plan = plan_renames(str(tmp_path))
+    assert sorted((op.source, op.target) for op in plan.operations) == [
+        ('Up.2009.1080p', 'Up 2009'),
+        (os.path.join('Up.2009.1080p', 'Up.2009.1080p.mkv'), os.path.join('Up.2009.1080p', 'Up 2009.mkv')),
+        (os.path.join('Up.2009.1080p', 'a.srt'), os.path.join('Up.2009.1080p', 'Up 2009.3.srt')),
+    ]
+    assert plan.conflicts == ()
@@ -0,0 +1,127 @@
+import os
+
+import pytest
+
+from movie_renamer import plan as plan_module
+from movie_renamer.journal import Journal, latest_journal, undo_journal
+from movie_renamer.pipeline import apply_renames
+from movie_renamer.plan import (PlanBuilder, RenameOp, RenamePlan, apply_plan, transaction_groups,
+                                validate_plan)
+from movie_renamer.stats import Stats
+
+
+@pytest.fixture
+def library(tmp_path, touch):
+    touch(tmp_path, 'Rel.A/a.mkv', 'Rel.A/a.srt', 'Rel.B/b.mkv')
+    builder = PlanBuilder(str(tmp_path))
+    builder.add('Rel.A/a.mkv', 'Rel.A/A (2000).mkv', 'movie')
+    builder.add('Rel.A/a.srt', 'Rel.A/A (2000).srt', 'subtitle')
+    builder.add('Rel.A', 'A (2000)', 'folder')
+    builder.add('Rel.B/b.mkv', 'Rel.B/B (2001).mkv', 'movie')
+    builder.add('Rel.B', 'B (2001)', 'folder')
+    return tmp_path, builder.build()
+
+
+def fail_on(monkeypatch, suffix):
+    rename = os.rename
+
+    def flaky(source, target):
+        if str(target).endswith(suffix):
+            raise OSError(f"cannot rename to {target}")
+        rename(source, target)
+
+    monkeypatch.setattr(plan_module.os, 'rename', flaky)
+
+
+def test_groups_follow_top_level_folders_and_chains():
+    ops = [RenameOp('A/x', 'A/y', 'movie'), RenameOp('A', 'A2', 'folder'), RenameOp('B', 'C', 'folder'),
+           RenameOp('C', 'D', 'folder'), RenameOp('E', 'F', 'folder')]
+    groups = [sorted(op.source for op in group) for group in transaction_groups(ops)]
+    assert sorted(groups) == [['A', 'A/x'], ['B', 'C'], ['E']]
+
+
+def test_failure_mid_group_restores_that_group_only(library, monkeypatch, tree):
+    root, plan = library
+    fail_on(monkeypatch, 'A (2000)')
+    stats = Stats()
+    with Journal.for_run(str(root)) as journal:
+        applied = apply_plan(plan, journal=journal, stats=stats)
+
+    assert [op.source for op in applied] == ['Rel.B/b.mkv', 'Rel.B']
+    assert tree(root) == ['B (2001)', 'B (2001)/B (2001).mkv', 'Rel.A', 'Rel.A/a.mkv', 'Rel.A/a.srt']
+    assert (stats.counts['error'], stats.counts['rolled_back'], stats.counts['renamed']) == (1, 2, 2)
+
+    # The rollback is journaled too, so undoing the run leaves the original tree
+    monkeypatch.undo()
+    assert undo_journal(journal.path) == (6, 0)
+    assert tree(root) == ['Rel.A', 'Rel.A/a.mkv', 'Rel.A/a.srt', 'Rel.B', 'Rel.B/b.mkv']
+
+
+def test_invalid_operation_skips_its_whole_group(library, tree):
+    root, plan = library
+    os.remove(root / 'Rel.A' / 'a.srt')
+    assert [(op.source, problem) for op, problem in validate_plan(plan)] == [('Rel.A/a.srt', 'source is missing')]
+
+    applied = apply_plan(plan)
+    assert [op.source for op in applied] == ['Rel.B/b.mkv', 'Rel.B']
+    assert tree(root) == ['B (2001)', 'B (2001)/B (2001).mkv', 'Rel.A', 'Rel.A/a.mkv']
+
+
+def test_validation_catches_taken_and_shared_targets(tmp_path, touch):
+    touch(tmp_path, 'a', 'b', 'c')
+    plan = RenamePlan(str(tmp_path), (RenameOp('a', 'c', 'file'), RenameOp('b', 'd', 'file'),
+                                      RenameOp('c', 'D', 'file')))
+    problems = [(op.source, problem) for op, problem in validate_plan(plan)]
+    assert problems == [('c', 'another rename has the same target')]
+
+
+def test_rolled_back_duplicate_move_leaves_no_empty_folders(tmp_path, monkeypatch, tree, touch):
+    touch(tmp_path, 'A/x.mkv', 'A/y.mkv')
+    plan = RenamePlan(str(tmp_path), (RenameOp('A/x.mkv', '.duplicates/A/x.mkv', 'duplicate'),
+                                      RenameOp('A/y.mkv', '.duplicates/A/y.mkv', 'duplicate')))
+    fail_on(monkeypatch, 'y.mkv')
+    assert apply_plan(plan) == []
+    assert tree(tmp_path) == ['A', 'A/x.mkv', 'A/y.mkv']
+
+
+def test_case_only_rename_and_undo(tmp_path, tree, touch):
+    touch(tmp_path, 'up/up.mkv')
+    builder = PlanBuilder(str(tmp_path))
+    builder.add('up', 'Up', 'folder')
+    with Journal.for_run(str(tmp_path)) as journal:
+        assert len(apply_plan(builder.build(), journal=journal)) == 1
+    assert tree(tmp_path) == ['Up', 'Up/up.mkv']
+
+    assert undo_journal(journal.path) == (1, 0)
+    assert tree(tmp_path) == ['up', 'up/up.mkv']
+
+
+def test_undo_accepts_case_only_rename_on_case_insensitive_filesystems(tmp_path, monkeypatch, tree, touch):
+    # Simulate a case-folding filesystem: both spellings resolve to the same file
+    touch(tmp_path, 'Up')
+    with Journal.for_run(str(tmp_path)) as journal:
+        journal.record(str(tmp_path / 'up'), str(tmp_path / 'Up'), 'folder')
+    real_lexists = os.path.lexists
+    monkeypatch.setattr('movie_renamer.journal.same_file', lambda new, old: True)
+    monkeypatch.setattr('movie_renamer.journal.os.path.lexists',
+                        lambda path: real_lexists(path) or str(path).casefold() == str(tmp_path / 'up').casefold())
+    assert undo_journal(journal.path) == (1, 0)
+    monkeypatch.undo()
+    assert tree(tmp_path) == ['up']
+
+
+def test_runs_in_the_same_second_get_their_own_journal(tmp_path):
+    paths = []
+    for _ in range(3):
+        with Journal.for_run(str(tmp_path)) as journal:
+            journal.record(str(tmp_path / 'a'), str(tmp_path / 'b'))
+        paths.append(journal.path)
+    assert len(set(paths)) == 3
+    assert latest_journal(str(tmp_path)) == paths[-1]
+
+
+def test_run_that_renames_nothing_reports_no_journal(tmp_path, capsys):
+    plan = RenamePlan(str(tmp_path), (RenameOp('gone.mkv', 'Gone (2000).mkv', 'movie'),))
+    assert apply_renames(plan) == []
+    assert 'journaled' not in capsys.readouterr().out
+    assert not os.path.exists(tmp_path / '.rename_journal')
@@ -0,0 +1,38 @@
+import os
+
+from movie_renamer.tv import episode_name, parse_episode, plan_episodes, rename_episodes
+
+SERIES = {'Title': 'Show', 'Year': '2005–', 'imdbID': 'tt1', 'totalSeasons': '1'}
+SEASONS = {('tt1', 1): {2: {'Title': 'Second'}, 3: {'Title': 'Third'}}}
+
+
+def test_multi_episode_file_keeps_every_episode():
+    info = parse_episode('Show.S01E02E03.1080p.mkv')
+    assert (info.episode, info.last_episode) == (2, 3)
+    assert episode_name(info) == 'Show - S01E02-E03'
+    assert episode_name(info, SERIES, SEASONS) == 'Show (2005) - S01E02-E03 - Second & Third'
+    assert episode_name(parse_episode('Show.S01E03.mkv'), SERIES, SEASONS) == 'Show (2005) - S01E03 - Third'
+
+
+def test_multi_episode_file_does_not_collide_with_its_last_episode(tmp_path):
+    (tmp_path / 'Show.S01E02E03.mkv').touch()
+    (tmp_path / 'Show.S01E03.mkv').touch()
+    plan = plan_episodes(str(tmp_path), offline=True)
+    assert sorted(op.target for op in plan.operations) == ['Show - S01E02-E03.mkv', 'Show - S01E03.mkv']
+    assert plan.conflicts == ()
+
+
+def test_renamed_episodes_are_left_alone(tmp_path):
+    (tmp_path / 'Doctor.Who.2005.S01E01.720p.mkv').touch()
+    (tmp_path / 'Show.S01E02E03.mkv').touch()
+    rename_episodes(str(tmp_path), dry_run=False, offline=True)
+    names = sorted(os.listdir(tmp_path))
+    assert 'Doctor Who (2005) - S01E01.mkv' in names
+
+    assert rename_episodes(str(tmp_path), dry_run=False, offline=True).operations == ()
+    assert sorted(os.listdir(tmp_path)) == names
+
+
+def test_show_year_survives_our_own_separator():
+    info = parse_episode('Doctor Who (2005) - S01E01 - Rose.mkv')
+    assert (info.show, info.year, info.episode) == ('Doctor Who', '2005', 1)
@@ -0,0 +1,42 @@
+import os
+import shutil
+
+from movie_renamer import watch
+from movie_renamer.pipeline import rename_stuff
+from movie_renamer.watch import Watcher, _snapshot
+
+
+def test_snapshot_tolerates_folders_vanishing_mid_scan(tmp_path, monkeypatch):
+    os.makedirs(tmp_path / 'Release' / 'tmp')
+    (tmp_path / 'Release' / 'movie.mkv').write_bytes(b'12345')
+    scandir = os.scandir
+
+    def racing_scandir(path):
+        if isinstance(path, str) and os.path.basename(path) == 'tmp':
+            shutil.rmtree(path)
+        return scandir(path)
+
+    monkeypatch.setattr(watch.os, 'scandir', racing_scandir)
+    count, size, _ = _snapshot(str(tmp_path / 'Release'))
+    assert (count, size) == (1, 5)
+
+
+def test_watcher_survives_a_failing_callback(tmp_path):
+    seen = []
+
+    def on_ready(name):
+        seen.append(name)
+        raise OSError("lookup failed")
+
+    watcher = Watcher(str(tmp_path), on_ready, settle=0, poll_interval=0.01, use_inotify=False)
+    (tmp_path / 'a.mkv').touch()
+    (tmp_path / 'b.mkv').touch()
+    watcher.run(stop=lambda: len(seen) == 2)
+    assert sorted(seen) == ['a.mkv', 'b.mkv']
+
+
+def test_watched_loose_video_is_renamed_in_place(tmp_path):
+    (tmp_path / 'Up.2009.1080p.BluRay.mkv').touch()
+    plan = rename_stuff(str(tmp_path), incremental=False, only={'Up.2009.1080p.BluRay.mkv'})
+    assert [(op.source, op.target) for op in plan.operations] == [('Up.2009.1080p.BluRay.mkv', 'Up 2009.mkv')]
+    assert (tmp_path / 'Up 2009.mkv').exists()